@@ -1,5 +1,6 @@
 from .app import Application
 from .start_page import StartPage
+from .animal_page import AnimalPage
 from .fish import FishPage
 from .bugs import BugPage
 from .sea_creatures import SeaCreaturePage
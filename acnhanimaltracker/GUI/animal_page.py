@@ -0,0 +1,330 @@
+import math
+import tkinter
+from datetime import datetime
+from tkinter import ttk
+from PIL import ImageTk
+from ..animals import NORTHERN, SOUTHERN, bitset
+from ..animals.image_ingest import THUMBNAIL_WIDTH
+from ..profiling import profiler
+
+
+class AnimalPage(ttk.Frame):
+    """Base page listing all animals of one kind from the AnimalCatalog.
+
+    Rows are inserted without images. Only the rows currently scrolled into
+    view (plus a small prefetch margin) get their image decoded in the
+    background, images of rows leaving that window are handed back to the
+    PhotoImageCache of the Application, which is shared by all pages.
+    Subclasses only define the kind of animals and the column title.
+
+    With populate=False the rows are inserted later in chunks via populate,
+    see Application.warm_up.
+
+    The search bar filters the rows by name, location, shadow and
+    availability through the indexes of the AnimalCatalog. Rows are never
+    deleted, non-matching ones are only detached from the Treeview and
+    reattached once they match again.
+
+    Args:
+        parent (ttk.Frame):  The container frame from Application.
+        controller (Application): The Application itself.
+        populate (bool, optional): Insert all rows right away.
+        Defaults to True.
+    """
+
+    kind = ""
+    title = ""
+    prefetch = 3
+    search_delay = 30
+    row_height = 200
+    compact_width = 48
+    compact_row_height = 56
+
+    @profiler.timed("page.construct")
+    def __init__(self, parent: ttk.Frame, controller, populate: bool = True):
+        super().__init__(parent)
+        self.controller = controller
+        self.animals = controller.catalog.query(kind=self.kind)
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self._build_search_bar()
+
+        self.thumbnail_width = THUMBNAIL_WIDTH
+        # Own style per page, so only this page changes in the compact view
+        self.style_name = f"{self.kind}.Treeview"
+        self.s = ttk.Style()
+        self.s.configure(
+            self.style_name,
+            rowheight=self.row_height,
+            highlightbackground="blue",
+            highlightthickness=20,
+        )
+        self.tree = ttk.Treeview(self, style=self.style_name)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        columns = (self.title, "ID")
+        self.tree.config(columns=columns)
+        self.tree.column(self.title, width=400, anchor="w")
+        self.tree.column("ID", width=15, anchor="center")
+        self.tree.heading(self.title, text=f"{self.title} - Information")
+        self.tree.heading("ID", text=f"{self.title} - ID")
+
+        self.rows = []
+        # The attached rows in display order, a subset of self.rows while
+        # a filter is active
+        self.shown = []
+        self.filtered = False
+        # Rows showing an image, mapped to its key in controller.photos
+        self.images = {}
+        # Rows waiting for the ImageDecoder, mapped to their latest request
+        self.pending = {}
+        self._requests = 0
+        self.tree.tag_configure("False", background="#8b0000")
+        self.tree.tag_configure("True", background="#006400")
+        self.tree.bind(
+            "<ButtonRelease-1>",
+            lambda event, catalog=controller.catalog: self.select_item(event, catalog),
+        )
+        if populate:
+            self.populate()
+
+    def _build_search_bar(self) -> None:
+        self.search_text = tkinter.StringVar(self)
+        self.location = tkinter.StringVar(self)
+        self.shadow = tkinter.StringVar(self)
+        self.catchable_now = tkinter.BooleanVar(self)
+        self._filter_job = None
+
+        search_bar = ttk.Frame(self)
+        search_bar.grid(row=0, column=0, columnspan=2, sticky="ew")
+        ttk.Label(search_bar, text="Search:").pack(side="left", padx=5, pady=5)
+        search_entry = ttk.Entry(search_bar, textvariable=self.search_text, width=30)
+        search_entry.pack(side="left", padx=5, pady=5)
+        # Keep <BackSpace> of the Application from leaving the page while typing
+        search_entry.bindtags((str(search_entry), "TEntry", "all"))
+        self.search_text.trace_add("write", lambda *_: self.schedule_filter())
+
+        for label, variable, attribute in (
+            ("Location:", self.location, "location"),
+            ("Shadow:", self.shadow, "shadow"),
+        ):
+            values = sorted({getattr(animal, attribute, None) for animal in self.animals} - {None})
+            if not values:
+                continue
+            ttk.Label(search_bar, text=label).pack(side="left", padx=5, pady=5)
+            box = ttk.Combobox(search_bar, textvariable=variable, values=[""] + values, state="readonly")
+            box.pack(side="left", padx=5, pady=5)
+            box.bind("<<ComboboxSelected>>", lambda event: self.schedule_filter())
+        ttk.Checkbutton(
+            search_bar, text="Catchable now", variable=self.catchable_now, command=self.schedule_filter
+        ).pack(side="left", padx=5, pady=5)
+        # Shared with the PlannerPage and the other pages
+        hemisphere = self.controller.hemisphere
+        ttk.Combobox(
+            search_bar, textvariable=hemisphere, values=[NORTHERN, SOUTHERN], state="readonly", width=10
+        ).pack(side="left", padx=5, pady=5)
+        hemisphere.trace_add("write", lambda *_: self.on_hemisphere_change())
+        self.compact = tkinter.BooleanVar(self)
+        ttk.Checkbutton(
+            search_bar, text="Compact", variable=self.compact, command=self.toggle_compact
+        ).pack(side="left", padx=5, pady=5)
+
+    def on_hemisphere_change(self) -> None:
+        """Filters again if the "Catchable now" filter depends on the
+        hemisphere chosen on any page."""
+        if self.catchable_now.get():
+            self.schedule_filter()
+
+    def toggle_compact(self) -> None:
+        """Switches between large rows and a compact list with small
+        thumbnails, which are stored in their own width and never shrunk
+        from the large ones."""
+        self.release_images()
+        if self.compact.get():
+            self.thumbnail_width = self.compact_width
+            self.s.configure(self.style_name, rowheight=self.compact_row_height)
+        else:
+            self.thumbnail_width = THUMBNAIL_WIDTH
+            self.s.configure(self.style_name, rowheight=self.row_height)
+        self.tree.update_idletasks()
+        self.load_visible(*map(float, self.tree.yview()))
+
+    def schedule_filter(self) -> None:
+        """Debounces the filter: it runs {search_delay} ms after the last
+        change of the search bar."""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(self.search_delay, self.apply_filter)
+
+    @profiler.timed("page.filter")
+    def apply_filter(self) -> None:
+        """Shows only the rows matching the search bar. All rows are inserted
+        first, then the Treeview gets the new list of attached rows in one
+        call, which detaches the others without deleting them."""
+        self._filter_job = None
+        self.populate()
+        filters = {"kind": self.kind}
+        if self.search_text.get().strip():
+            filters["name"] = self.search_text.get().strip()
+        if self.location.get():
+            filters["location"] = self.location.get()
+        if self.shadow.get():
+            filters["shadow"] = self.shadow.get()
+        if self.catchable_now.get():
+            filters["available_at"] = datetime.now()
+            filters["hemisphere"] = self.controller.hemisphere.get()
+        self.filtered = len(filters) > 1
+        catalog = self.controller.catalog
+        shown = [
+            str(catalog.animals[position].id)
+            for position in bitset.to_positions(catalog.query_bits(**filters))
+        ]
+        if shown != self.shown:
+            self.shown = shown
+            self.tree.set_children("", *shown)
+            self.tree.yview_moveto(0.0)
+            self.load_visible(0.0, 0.0)
+
+    @property
+    def progress(self) -> float:
+        """Fraction of all rows already inserted."""
+        if not self.animals:
+            return 1.0
+        return len(self.rows) / len(self.animals)
+
+    def populate(self, chunk_size: int | None = None) -> bool:
+        """Inserts the next {chunk_size} rows, or all remaining rows.
+
+        Args:
+            chunk_size (int, optional): Maximum number of rows to insert.
+            Defaults to None.
+
+        Returns:
+            bool: True if all rows are inserted
+        """
+        start = len(self.rows)
+        end = len(self.animals) if chunk_size is None else min(len(self.animals), start + chunk_size)
+        for animal in self.animals[start:end]:
+            with profiler.phase("page.insert_row"):
+                self.rows.append(
+                    self.tree.insert(
+                        "",
+                        "end",
+                        iid=str(animal.id),
+                        values=[animal, animal.id],
+                        tags=str(animal.caught),
+                    )
+                )
+        if self.filtered and start < end:
+            self.tree.detach(*self.rows[start:end])
+        else:
+            self.shown.extend(self.rows[start:end])
+        return len(self.rows) == len(self.animals)
+
+    def refresh_caught(self) -> None:
+        """Updates the color of every inserted row to the caught status of
+        its animal, e.g. after switching the profile."""
+        for row in self.rows:
+            animal = self.controller.catalog.get(self.kind, int(row))
+            self.tree.item(row, tags=str(animal.caught))
+
+    def _on_scroll(self, first: str, last: str) -> None:
+        """yscrollcommand of the Treeview. Tk calls it whenever the visible
+        part of the list changes (scrolling, resizing, first mapping)."""
+        self.scrollbar.set(first, last)
+        self.load_visible(float(first), float(last))
+
+    def visible_rows(self, first: float, last: float) -> list[str]:
+        """Returns the ids of the shown rows between the fractions first and
+        last of the list, extended by the prefetch margin."""
+        start = max(0, int(first * len(self.shown)) - self.prefetch)
+        end = min(len(self.shown), math.ceil(last * len(self.shown)) + self.prefetch)
+        return self.shown[start:end]
+
+    def load_visible(self, first: float, last: float) -> None:
+        """Requests the images of all visible rows from the ImageDecoder of
+        the Application and releases the images of every other row. Rows show
+        a placeholder until their image is decoded.
+
+        Args:
+            first (float): Fraction of the list above the visible part
+            last (float): Fraction of the list up to the end of the visible part
+        """
+        visible = self.visible_rows(first, last)
+        self.release_images((set(self.images) | set(self.pending)) - set(visible))
+        decoder, photos = self.controller.decoder, self.controller.photos
+        for row in visible:
+            if row in self.images or row in self.pending:
+                continue
+            animal = self.controller.catalog.get(self.kind, int(row))
+            key = (animal.kind, animal.save_name, self.thumbnail_width)
+            photo = photos.acquire(key)
+            if photo is not None:
+                self.images[row] = key
+                self.tree.item(row, image=photo)
+                continue
+            self._requests += 1
+            self.pending[row] = self._requests
+            self.tree.item(row, image=decoder.placeholder)
+            decoder.submit(
+                animal.kind,
+                animal.save_name,
+                lambda image, row=row, request=self._requests, key=key: self._image_decoded(
+                    row, request, key, image
+                ),
+                self.thumbnail_width,
+            )
+
+    def release_images(self, rows=None) -> None:
+        """Removes the images of the given rows (default: all rows) and
+        hands them back to the PhotoImageCache.
+
+        Args:
+            rows (Iterable[str], optional): Defaults to None.
+        """
+        if rows is None:
+            rows = set(self.images) | set(self.pending)
+        for row in rows:
+            self.tree.item(row, image="")
+            key = self.images.pop(row, None)
+            if key is not None:
+                self.controller.photos.release(key)
+            self.pending.pop(row, None)
+
+    def _image_decoded(self, row: str, request: int, key: tuple, image) -> None:
+        """Shows a decoded image unless its row left the visible part (or was
+        requested again) in the meantime."""
+        if self.pending.get(row) != request:
+            return
+        del self.pending[row]
+        if image is None:
+            return
+        # Another page may have cached the same image meanwhile
+        photo = self.controller.photos.acquire(key)
+        if photo is None:
+            with profiler.phase("image.photoimage"):
+                photo = self.controller.photos.add(key, ImageTk.PhotoImage(image))
+        self.images[row] = key
+        self.tree.item(row, image=photo)
+
+    def select_item(self, _, catalog):
+        """On click of a row, changes the status of a animal (caught - uncaught)
+        visualised by a change of color
+
+        Args:
+            _ (_type_): Event
+            catalog (AnimalCatalog): The catalog of the Application
+        """
+        curItem = self.tree.focus()
+        if not curItem:
+            return
+        animal = catalog.get(self.kind, int(curItem))
+        animal.switch_caught_status()
+        if animal.caught:
+            self.s.map(self.style_name, background=[("selected", "#006400")])
+        else:
+            self.s.map(self.style_name, background=[("selected", "#8b0000")])
+        self.tree.item(curItem, tags=(f"{str(animal.caught)}"))
@@ -1,5 +1,9 @@
 import tkinter
 from tkinter import ttk
+from ..animals import AnimalCatalog, NORTHERN, ThumbnailLoader
+from ..profiling import profiler
+from .image_decoder import ImageDecoder
+from .photo_cache import PhotoImageCache
 from .start_page import StartPage
 from .bugs import BugPage
 from .fish import FishPage
@@ -10,13 +14,22 @@ LARGE_FONT = ("Verdana", 12)
 
 class Application(tkinter.Tk):
     """The root application hosting all subsequent frames and widgets.
+    Only the StartPage is built right away, see warm_up.
 
     Args:
         animal_list (list): The list created by AnimalHandler.load_animals()
         root_directory (str): The root directory created in main.py
+        catalog (AnimalCatalog, optional): The catalog created by
+        AnimalHandler.build_catalog(). Built from animal_list if not given.
+        animal_handler (AnimalHandler, optional): Enables switching profiles
+        on the StartPage. Defaults to None.
     """
 
-    def __init__(self, animal_list, root_directory) -> None:
+    warm_up_delay = 100
+    warm_up_interval = 1
+    warm_up_chunk_size = 20
+
+    def __init__(self, animal_list, root_directory, catalog=None, animal_handler=None) -> None:
         super().__init__()
         # Initialize Base Configuration
         self.title("Animal Crossing New Horizons - Animal Tracker")
@@ -24,22 +37,34 @@ class Application(tkinter.Tk):
 
         # Load in animals
         self.animal_list = animal_list
+        self.catalog = catalog or AnimalCatalog(animal_list)
+        self.animal_handler = animal_handler
+        # Shared by the PlannerPage and the "Catchable now" filter of the pages
+        self.hemisphere = tkinter.StringVar(self, NORTHERN)
 
         self.root_directory = root_directory
+        self.thumbnails = ThumbnailLoader(root_directory)
+        self.decoder = ImageDecoder(self, self.thumbnails)
+        self.photos = PhotoImageCache()
         # Initialize Base Container
         container = ttk.Frame(self)
         container.pack(side="top", fill="both", expand=True)
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
 
+        self.container = container
+
+        # Animal pages are built on first use or warmed up in the background
+        self.page_classes = {
+            "fish": FishPage,
+            "bugs": BugPage,
+            "sea_creatures": SeaCreaturePage,
+        }
+        self.pages = {}
+        self.planner_page = None
+
         self.start_page = StartPage(container, self)
         self.start_page.grid(row=0, column=0, sticky="nsew")
-        self.fish_page = FishPage(container, self)
-        self.fish_page.grid(row=0, column=0, sticky="nsew")
-        self.bug_page = BugPage(container, self)
-        self.bug_page.grid(row=0, column=0, sticky="nsew")
-        self.sea_creature_page = SeaCreaturePage(container, self)
-        self.sea_creature_page.grid(row=0, column=0, sticky="nsew")
 
         # Load up StartPage
         self.show_frame(self.start_page)
@@ -48,6 +73,94 @@ class Application(tkinter.Tk):
             "<BackSpace->",
             lambda event: self.show_frame(self.start_page, _=event),
         )
+        self.after(self.warm_up_delay, self.warm_up)
+
+    @property
+    def fish_page(self):
+        return self.get_page("fish")
+
+    @property
+    def bug_page(self):
+        return self.get_page("bugs")
+
+    @property
+    def sea_creature_page(self):
+        return self.get_page("sea_creatures")
+
+    def get_page(self, kind: str):
+        """Returns the page of a kind of animals (e.g.: "fish"), creating it
+        without any rows if it does not exist yet.
+
+        Args:
+            kind (str): The kind of the animals shown on the page
+        """
+        page = self.pages.get(kind)
+        if page is None:
+            page = self.page_classes[kind](self.container, self, populate=False)
+            page.grid(row=0, column=0, sticky="nsew")
+            # Newly gridded frames are stacked on top, keep the current one
+            page.lower()
+            self.pages[kind] = page
+        return page
+
+    def show_page(self, kind: str, _=None):
+        """Shows the page of a kind of animals, inserting all remaining rows
+        if the warm up did not finish it yet.
+
+        Args:
+            kind (str): The kind of the animals shown on the page
+        """
+        page = self.get_page(kind)
+        page.populate()
+        self.start_page.set_progress(kind, page.progress)
+        self.show_frame(page)
+
+    def show_planner(self, _=None):
+        """Shows the PlannerPage, creating it on first use, with lists
+        recomputed for the current progress."""
+        if self.planner_page is None:
+            # Imported on first use, numpy would slow down every start
+            from .planner_page import PlannerPage
+
+            self.planner_page = PlannerPage(self.container, self)
+            self.planner_page.grid(row=0, column=0, sticky="nsew")
+        self.planner_page.refresh()
+        self.show_frame(self.planner_page)
+
+    @profiler.timed("warm_up")
+    def warm_up(self) -> None:
+        """Builds the animal pages in small chunks while the application is
+        idle. Every chunk reschedules itself through after() so the start page
+        stays responsive and shows the progress on its buttons.
+        """
+        for kind in self.page_classes:
+            page = self.get_page(kind)
+            if page.progress < 1.0:
+                done = page.populate(self.warm_up_chunk_size)
+                self.start_page.set_progress(kind, page.progress)
+                if done:
+                    # Decode the first rows so the page shows up with images
+                    page.load_visible(0.0, 0.0)
+                self.after(self.warm_up_interval, self.warm_up)
+                return
+        # Last step: the name index used by the search bars of the pages
+        self.catalog.name_index
+
+    def switch_profile(self, name: str) -> None:
+        """Switches to the progress of another profile, creating it if it
+        does not exist yet. Only the row colors of the built pages change,
+        the catalog and the images stay loaded.
+
+        Args:
+            name (str): Name of the profile
+        """
+        self.animal_handler.switch_profile(name, self.animal_list, create=True)
+        for page in self.pages.values():
+            page.refresh_caught()
+
+    def destroy(self) -> None:
+        self.decoder.close()
+        super().destroy()
 
     def show_frame(self, frame, _=None):
         frame.tkraise()
@@ -0,0 +1,80 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageDraw, ImageTk
+from ..animals.image_ingest import THUMBNAIL_WIDTH
+from ..profiling import profiler
+
+
+class ImageDecoder:
+    """Decodes thumbnails in a pool of worker threads so the Tk main thread
+    never waits for PIL. Decoded images are passed back through a queue that
+    the Tk thread drains via after(), where only the cheap wrapping into a
+    PhotoImage happens.
+
+    Args:
+        widget (tkinter.Misc): Widget whose after() drains the queue, usually
+        the Application
+        thumbnails (ThumbnailLoader): Source of the thumbnails
+        workers (int, optional): Decoding threads. Defaults to 4.
+        interval (int, optional): Milliseconds between two drains.
+        Defaults to 15.
+        budget (float, optional): Seconds a single drain may spend wrapping
+        images before it yields to the event loop. Defaults to 0.008.
+    """
+
+    def __init__(
+        self, widget, thumbnails, workers: int = 4, interval: int = 15, budget: float = 0.008
+    ) -> None:
+        self.widget = widget
+        self.thumbnails = thumbnails
+        self.interval = interval
+        self.budget = budget
+        self.results = queue.Queue()
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="decode")
+        self._job = self.widget.after(self.interval, self._drain)
+
+        placeholder = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(placeholder)
+        draw.rounded_rectangle((4, 4, 59, 59), radius=10, fill=(200, 200, 200, 255))
+        for x in (20, 32, 44):
+            draw.ellipse((x - 3, 29, x + 3, 35), fill=(130, 130, 130, 255))
+        self.placeholder = ImageTk.PhotoImage(placeholder)
+
+    def submit(self, kind: str, save_name: str, callback, width: int = THUMBNAIL_WIDTH) -> None:
+        """Decodes the thumbnail of an animal in the background.
+
+        Args:
+            kind (str): The kind of the animal (e.g.: "fish")
+            save_name (str): The save_name of the animal
+            callback (Callable[[Image.Image | None], None]): Called on the Tk
+            thread with the decoded image, or None if it could not be read
+            width (int, optional): One of THUMBNAIL_WIDTHS.
+            Defaults to THUMBNAIL_WIDTH.
+        """
+        self._executor.submit(self._decode, kind, save_name, width, callback)
+
+    def _decode(self, kind: str, save_name: str, width: int, callback) -> None:
+        try:
+            with profiler.phase("image.decode"):
+                image = self.thumbnails.open(kind, save_name, width)
+                image.load()
+        except (OSError, KeyError) as error:
+            print(f"Could not load the image of {save_name}: {error}")
+            image = None
+        self.results.put((callback, image))
+
+    def _drain(self) -> None:
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            try:
+                callback, image = self.results.get_nowait()
+            except queue.Empty:
+                break
+            callback(image)
+        self._job = self.widget.after(self.interval, self._drain)
+
+    def close(self) -> None:
+        """Stops draining and drops all pending work."""
+        self.widget.after_cancel(self._job)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from PIL import ImageTk
+
+
+class PhotoImageCache:
+    """PhotoImages shared by all pages, bounded by a memory budget.
+
+    Entries are keyed by (kind, save_name, width) and counted as
+    width * height * 4 bytes. Pages acquire the images of their visible rows
+    and release them when the rows leave the view. Only released entries are
+    evicted, least recently used first, so a row never loses its image while
+    it is shown.
+
+    Args:
+        budget (int, optional): Bytes of decoded images to keep.
+        Defaults to 64 MiB.
+    """
+
+    def __init__(self, budget: int = 64 * 1024 * 1024) -> None:
+        self.budget = budget
+        self.size = 0
+        self._entries = OrderedDict()
+        self._users = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    def acquire(self, key: tuple) -> ImageTk.PhotoImage | None:
+        """Returns a cached image and marks it as in use.
+
+        Args:
+            key (tuple): (kind, save_name, width)
+
+        Returns:
+            ImageTk.PhotoImage | None: The image or None if it is not cached
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self._users[key] = self._users.get(key, 0) + 1
+        return entry[0]
+
+    def add(self, key: tuple, photo: ImageTk.PhotoImage) -> ImageTk.PhotoImage:
+        """Caches a new image, marked as in use like acquire.
+
+        Args:
+            key (tuple): (kind, save_name, width)
+            photo (ImageTk.PhotoImage): The image
+
+        Returns:
+            ImageTk.PhotoImage: The image
+        """
+        if key in self._entries:
+            self.size -= self._entries[key][1]
+        size = photo.width() * photo.height() * 4
+        self._entries[key] = (photo, size)
+        self._entries.move_to_end(key)
+        self.size += size
+        self._users[key] = self._users.get(key, 0) + 1
+        self._evict()
+        return photo
+
+    def release(self, key: tuple) -> None:
+        """Marks an image as no longer shown by one of its users."""
+        users = self._users.get(key, 0) - 1
+        if users > 0:
+            self._users[key] = users
+        else:
+            self._users.pop(key, None)
+        self._evict()
+
+    def _evict(self) -> None:
+        for key in list(self._entries):
+            if self.size <= self.budget:
+                return
+            if key not in self._users:
+                self.size -= self._entries.pop(key)[1]
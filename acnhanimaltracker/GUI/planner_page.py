@@ -0,0 +1,76 @@
+import calendar
+import tkinter
+from datetime import datetime
+from tkinter import ttk
+from ..animals import NORTHERN, SOUTHERN
+from ..animals.planner import AnimalPlanner
+
+LARGE_FONT = ("Verdana", 14)
+
+
+class PlannerPage(ttk.Frame):
+    """Plans ahead with the AnimalPlanner: the uncaught animals leaving after
+    a month, the hours with the most uncaught species and the best
+    bells-per-hour windows. The lists are recomputed whenever the page is
+    shown or an option changes.
+
+    Args:
+        parent (ttk.Frame): The container frame from Application.
+        controller (Application): The Application itself.
+    """
+
+    window_lengths = (1, 2, 3, 4, 6)
+
+    def __init__(self, parent: ttk.Frame, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.planner = AnimalPlanner(controller.catalog)
+        self.grid_rowconfigure(2, weight=1)
+        for column in range(3):
+            self.grid_columnconfigure(column, weight=1)
+
+        label = ttk.Label(self, text="Plan Ahead", font=LARGE_FONT)
+        label.grid(column=0, columnspan=3, row=0, pady=10)
+
+        self.month = tkinter.StringVar(self, calendar.month_name[datetime.now().month])
+        self.hemisphere = controller.hemisphere
+        self.window_length = tkinter.StringVar(self, "2")
+        options = ttk.Frame(self)
+        options.grid(row=1, column=0, columnspan=3, sticky="ew")
+        for text, variable, values in (
+            ("Month:", self.month, list(calendar.month_name)[1:]),
+            ("Hemisphere:", self.hemisphere, [NORTHERN, SOUTHERN]),
+            ("Window (hours):", self.window_length, [str(length) for length in self.window_lengths]),
+        ):
+            ttk.Label(options, text=text).pack(side="left", padx=5, pady=5)
+            box = ttk.Combobox(options, textvariable=variable, values=values, state="readonly", width=12)
+            box.pack(side="left", padx=5, pady=5)
+            box.bind("<<ComboboxSelected>>", lambda event: self.refresh())
+
+        self.leaving = self._build_list(0, ("Leaving after this month", "Bells"))
+        self.hours = self._build_list(1, ("Hour", "Uncaught species"))
+        self.windows = self._build_list(2, ("Window", "Bells per hour"))
+
+    def _build_list(self, column: int, headings: tuple[str, str]) -> ttk.Treeview:
+        tree = ttk.Treeview(self, columns=headings, show="headings")
+        for heading in headings:
+            tree.heading(heading, text=heading)
+            tree.column(heading, width=150, anchor="w")
+        tree.grid(row=2, column=column, sticky="nsew", padx=5, pady=5)
+        return tree
+
+    def refresh(self) -> None:
+        """Recomputes all lists for the selected options."""
+        month = list(calendar.month_name).index(self.month.get())
+        hemisphere = self.hemisphere.get()
+        length = int(self.window_length.get())
+        for tree in (self.leaving, self.hours, self.windows):
+            tree.delete(*tree.get_children())
+        for animal in self.planner.leaving(month, hemisphere):
+            bells = max(animal.price, getattr(animal, "surcharge", 0))
+            self.leaving.insert("", "end", values=(animal.name.title(), bells))
+        for hour, species in self.planner.best_hours(month, hemisphere):
+            self.hours.insert("", "end", values=(f"{hour:02d}:00", species))
+        for start, bells in self.planner.best_windows(month, hemisphere, length, count=24):
+            window = f"{start:02d}:00 - {(start + length) % 24:02d}:00"
+            self.windows.insert("", "end", values=(window, f"{bells:,.0f}"))
@@ -1,5 +1,5 @@
 from tkinter import ttk
-from PIL import ImageTk, Image
+from PIL import ImageTk
 
 LARGE_FONT = ("Verdana", 14)
 
@@ -22,10 +22,9 @@ class StartPage(ttk.Frame):
             font=LARGE_FONT,
         )
         label.grid(column=0, columnspan=3, row=0, pady=20, padx=20)
+        self.buttons = {}
 
-        img1 = Image.open(
-            f"{controller.root_directory}/acnhanimaltracker/animals/images/fish/arapaima44.png"
-        )
+        img1 = controller.thumbnails.open("fish", "arapaima44")
         img1 = ImageTk.PhotoImage(img1)
         image_label1 = ttk.Label(self, image=img1)
         image_label1.image = img1  # type: ignore
@@ -34,13 +33,12 @@ class StartPage(ttk.Frame):
             self,
             text="Visit Fish Page",
             width=30,
-            command=lambda: controller.show_frame(controller.fish_page),
+            command=lambda: controller.show_page("fish"),
         )
         button1.grid(column=0, row=2, pady=20, padx=20)
+        self.buttons["fish"] = (button1, "Visit Fish Page")
 
-        img2 = Image.open(
-            f"{controller.root_directory}/acnhanimaltracker/animals/images/bugs/centipede77.png"
-        )
+        img2 = controller.thumbnails.open("bugs", "centipede77")
         img2 = ImageTk.PhotoImage(img2)
         image_label2 = ttk.Label(self, image=img2)
         image_label2.image = img2  # type: ignore
@@ -49,13 +47,12 @@ class StartPage(ttk.Frame):
             self,
             text="Visit Bug Page",
             width=30,
-            command=lambda: controller.show_frame(controller.bug_page),
+            command=lambda: controller.show_page("bugs"),
         )
         button2.grid(column=1, row=2, pady=20, padx=20)
+        self.buttons["bugs"] = (button2, "Visit Bug Page")
 
-        img3 = Image.open(
-            f"{controller.root_directory}/acnhanimaltracker/animals/images/sea_creatures/vampire squid22.png"
-        )
+        img3 = controller.thumbnails.open("sea_creatures", "vampire squid22")
         img3 = ImageTk.PhotoImage(img3)
         image_label3 = ttk.Label(self, image=img3)
         image_label3.image = img3  # type: ignore
@@ -64,6 +61,53 @@ class StartPage(ttk.Frame):
             self,
             text="Visit Sea Creature Page",
             width=30,
-            command=lambda: controller.show_frame(controller.sea_creature_page),
+            command=lambda: controller.show_page("sea_creatures"),
         )
         button3.grid(column=2, row=2, pady=20, padx=20)
+        self.buttons["sea_creatures"] = (button3, "Visit Sea Creature Page")
+
+        planner_button = ttk.Button(
+            self,
+            text="Plan Ahead",
+            width=30,
+            command=controller.show_planner,
+        )
+        planner_button.grid(column=2, row=3, pady=20, padx=20)
+
+        self.profile_box = None
+        if controller.animal_handler is not None:
+            store = controller.animal_handler.store
+            profile_label = ttk.Label(self, text="Profile (type a new name to create one):")
+            profile_label.grid(column=0, row=3, pady=20, padx=20, sticky="e")
+            self.profile_box = ttk.Combobox(self, values=store.profiles(), width=30)
+            self.profile_box.set(controller.animal_handler.profile or store.active_profile())
+            self.profile_box.grid(column=1, row=3, pady=20, padx=20)
+            self.profile_box.bind(
+                "<<ComboboxSelected>>", lambda event: self.switch_profile(controller)
+            )
+            self.profile_box.bind("<Return>", lambda event: self.switch_profile(controller))
+
+    def switch_profile(self, controller) -> None:
+        """Switches to the profile entered in the profile box.
+
+        Args:
+            controller (Application): The Application itself.
+        """
+        name = self.profile_box.get().strip()
+        if not name:
+            return
+        controller.switch_profile(name)
+        self.profile_box.config(values=controller.animal_handler.store.profiles())
+
+    def set_progress(self, kind: str, progress: float) -> None:
+        """Shows the warm up progress of an animal page on its button.
+
+        Args:
+            kind (str): The kind of the animals shown on the page
+            progress (float): Fraction of the page already built
+        """
+        button, text = self.buttons[kind]
+        if progress < 1.0:
+            button.config(text=f"{text} (loading {progress:.0%})")
+        else:
+            button.config(text=text)
@@ -1,2 +1,9 @@
 from .animal import Fish, Bug, SeaCreature
 from .animal_handler import AnimalHandler
+from .availability import AvailabilityIndex, NORTHERN, SOUTHERN
+from .catalog import AnimalCatalog
+from .thumbnail_atlas import ThumbnailAtlas, ThumbnailAtlasWriter, ThumbnailLoader
+from .downloader import Downloader, DownloadError, DownloadResult
+from .columnar import ColumnarCatalog
+from .manifest import IntegrityReport, Manifest
+from .journal import ProgressJournal
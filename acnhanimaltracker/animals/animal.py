@@ -1,26 +1,68 @@
+import sys
+
+
+def _to_mask(values: list[int], offset: int = 0) -> int:
+    """Packs a list like the 'time-array' or 'month-array-northern' of the API
+    into an integer with one bit per hour or month."""
+    mask = 0
+    for value in values:
+        mask |= 1 << (value - offset)
+    return mask
+
+
+def _from_mask(mask: int, offset: int = 0) -> list[int]:
+    """Unpacks an integer created by _to_mask into a sorted list."""
+    return [bit + offset for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+
 class Animal:
     """Base class of every animal in Animal Crossing New Horizons. It tries to
     model relevant data based on the API https://acnhapi.com/v1/{endpoint}.
     For this purpose it currently models those attributes specified in the
     __init__ method.
 
+    The api_response itself is not kept. Every animal only holds the few
+    attributes used by the application in __slots__, recurring strings like
+    location, shadow or rarity are interned and the availability is stored as
+    bitmasks (hour_mask: bit 0-23, month_mask and month_mask_southern:
+    bit 0-11 for January-December). time, months and months_southern still
+    return the lists of the API.
+
     Requires
         api_response [dict]: A single json-response from the api-endpoint
         (e.g.: https://acnhapi.com/v1/fish/1)
         root_directory [str]: The root directory path to
-        sort saving and loading."""
+        sort saving and loading.
+
+    Every change of the caught status is reported to the attached
+    ChangeTracker (if any), see AnimalHandler.load_animals."""
+
+    __slots__ = (
+        "root_directory",
+        "name",
+        "id",
+        "save_name",
+        "hour_mask",
+        "month_mask",
+        "month_mask_southern",
+        "price",
+        "caught",
+        "image_url",
+        "tracker",
+    )
 
     def __init__(self, api_response: dict, root_directory: str) -> None:
-        self.api_response = api_response
         self.root_directory = root_directory
-        self.name = self._get_name()
-        self.id = self._get_id()
+        self.name = self._get_name(api_response)
+        self.id = self._get_id(api_response)
         self.save_name = self.name + str(self.id)
-        self.time = self._get_time()
-        self.months = self._get_months()
-        self.price = self._get_price()
+        self.hour_mask = _to_mask(self._get_time(api_response))
+        self.month_mask = _to_mask(self._get_months(api_response), offset=1)
+        self.month_mask_southern = _to_mask(self._get_months_southern(api_response), offset=1)
+        self.price = self._get_price(api_response)
         self.caught = False
-        self.image_url = self._get_image_url()
+        self.image_url = self._get_image_url(api_response)
+        self.tracker = None
 
     def __str__(self):
         return f"""
@@ -31,43 +73,132 @@ class Animal:
         Price: {self.price}
         Caught: {self.caught}"""
 
-    def _get_name(self):
-        if "name-USen" not in self.api_response["name"]:
+    @classmethod
+    def from_fields(cls, root_directory: str, **fields):
+        """Creates an animal directly from its attribute values (e.g.: read
+        from a ColumnarCatalog) instead of an api_response.
+
+        Args:
+            root_directory (str): The root directory path
+            **fields: A value for every attribute in __slots__ except
+            root_directory, caught and tracker
+        """
+        animal = cls.__new__(cls)
+        animal.root_directory = root_directory
+        for slot, value in fields.items():
+            setattr(animal, slot, value)
+        animal.caught = False
+        animal.tracker = None
+        return animal
+
+    @classmethod
+    def _state_slots(cls) -> list[str]:
+        return [
+            slot
+            for klass in reversed(cls.__mro__)
+            for slot in getattr(klass, "__slots__", ())
+            if slot != "tracker"
+        ]
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self._state_slots())
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # Pickles of the old layout still hold the whole api_response
+            self.__init__(state["api_response"], state["root_directory"])
+            self.caught = state.get("caught", False)
+            return
+        for slot, value in zip(self._state_slots(), state):
+            setattr(self, slot, value)
+        self.tracker = None
+
+    def update(self, api_response: dict) -> None:
+        """Updates all attributes from a newer api_response while keeping the
+        caught status and the attached tracker.
+
+        Args:
+            api_response (dict): A single json-response from the api-endpoint
+        """
+        caught, tracker = self.caught, self.tracker
+        self.__init__(api_response, self.root_directory)
+        self.caught, self.tracker = caught, tracker
+
+    @property
+    def time(self) -> list[int]:
+        return _from_mask(self.hour_mask)
+
+    @property
+    def months(self) -> list[int]:
+        return _from_mask(self.month_mask, offset=1)
+
+    @property
+    def months_southern(self) -> list[int]:
+        return _from_mask(self.month_mask_southern, offset=1)
+
+    def is_available(self, hour: int, month: int, southern: bool = False) -> bool:
+        """Checks if the animal can be caught at the given hour and month.
+
+        Args:
+            hour (int): Hour of the day (0-23)
+            month (int): Month of the year (1-12)
+            southern (bool, optional): Use the southern hemisphere months.
+            Defaults to False.
+
+        Returns:
+            bool: True if the animal is available
+        """
+        month_mask = self.month_mask_southern if southern else self.month_mask
+        return bool(self.hour_mask >> hour & 1 and month_mask >> (month - 1) & 1)
+
+    def _get_name(self, api_response: dict):
+        if "name-USen" not in api_response["name"]:
             raise KeyError("Key 'name-USen' not found")
-        return self.api_response["name"]["name-USen"]
+        return api_response["name"]["name-USen"]
 
-    def _get_id(self):
-        if "id" not in self.api_response:
+    def _get_id(self, api_response: dict):
+        if "id" not in api_response:
             raise KeyError("Key 'id' not found")
-        return self.api_response["id"]
+        return api_response["id"]
 
-    def _get_time(self):
-        if "time-array" not in self.api_response["availability"]:
+    def _get_time(self, api_response: dict):
+        if "time-array" not in api_response["availability"]:
             raise KeyError("Key 'time-array' not found")
-        return self.api_response["availability"]["time-array"]
+        return api_response["availability"]["time-array"]
 
-    def _get_months(self):
-        if "month-array-northern" not in self.api_response["availability"]:
+    def _get_months(self, api_response: dict):
+        if "month-array-northern" not in api_response["availability"]:
             raise KeyError("Key 'month-array-northern' not found")
-        return self.api_response["availability"]["month-array-northern"]
+        return api_response["availability"]["month-array-northern"]
+
+    def _get_months_southern(self, api_response: dict):
+        if "month-array-southern" not in api_response["availability"]:
+            raise KeyError("Key 'month-array-southern' not found")
+        return api_response["availability"]["month-array-southern"]
 
-    def _get_price(self):
-        if "price" not in self.api_response:
+    def _get_price(self, api_response: dict):
+        if "price" not in api_response:
             raise KeyError("Key 'price' not found")
-        return self.api_response["price"]
+        return api_response["price"]
 
-    def _get_image_url(self):
-        if "image_uri" not in self.api_response:
+    def _get_image_url(self, api_response: dict):
+        if "image_uri" not in api_response:
             raise KeyError("Key 'image_uri' not found")
-        return self.api_response["image_uri"]
+        return api_response["image_uri"]
 
     def switch_caught_status(self):
         self.caught = not self.caught
+        if self.tracker is not None:
+            self.tracker.mark(self)
 
     def set_caught_status(self, boolean: bool):
         if not isinstance(boolean, bool):
             raise ValueError(f"{boolean} is not of type bool - type of {type(boolean)}")
+        if self.caught == boolean:
+            return
         self.caught = boolean
+        if self.tracker is not None:
+            self.tracker.mark(self)
 
 
 class Fish(Animal):
@@ -78,13 +209,15 @@ class Fish(Animal):
         Animal (BaseClass): See Animal Base Class for more information
     """
 
+    kind = "fish"
+    __slots__ = ("rarity", "shadow", "surcharge", "location")
+
     def __init__(self, api_response: dict, root_directory: str) -> None:
         super().__init__(api_response, root_directory)
-        self.rarity = self._get_rarity()
-        self.shadow = self._get_shadow()
-        self.surcharge = self._get_surcharge()
-        self.location = self._get_location()
-        self.image_path = self._get_image_path()
+        self.rarity = sys.intern(self._get_rarity(api_response))
+        self.shadow = sys.intern(self._get_shadow(api_response))
+        self.surcharge = self._get_surcharge(api_response)
+        self.location = sys.intern(self._get_location(api_response))
 
     def __str__(self):
         return f"""
@@ -97,27 +230,28 @@ class Fish(Animal):
         Price: {self.price}
         Surcharge: {self.surcharge}"""
 
-    def _get_shadow(self):
-        if "shadow" not in self.api_response:
+    def _get_shadow(self, api_response: dict):
+        if "shadow" not in api_response:
             raise KeyError("Key 'shadow' not found")
-        return self.api_response["shadow"]
+        return api_response["shadow"]
 
-    def _get_surcharge(self):
-        if "price-cj" not in self.api_response:
+    def _get_surcharge(self, api_response: dict):
+        if "price-cj" not in api_response:
             raise KeyError("Key 'price-cj' not found")
-        return self.api_response["price-cj"]
+        return api_response["price-cj"]
 
-    def _get_rarity(self):
-        if "rarity" not in self.api_response["availability"]:
+    def _get_rarity(self, api_response: dict):
+        if "rarity" not in api_response["availability"]:
             raise KeyError("Key 'rarity' not found")
-        return self.api_response["availability"]["rarity"]
+        return api_response["availability"]["rarity"]
 
-    def _get_location(self):
-        if "location" not in self.api_response["availability"]:
+    def _get_location(self, api_response: dict):
+        if "location" not in api_response["availability"]:
             raise KeyError("Key 'location' not found")
-        return self.api_response["availability"]["location"]
+        return api_response["availability"]["location"]
 
-    def _get_image_path(self):
+    @property
+    def image_path(self):
         return f"{self.root_directory}/acnhanimaltracker/animals/images/fish/{self.save_name}.png"
 
 
@@ -129,12 +263,14 @@ class Bug(Animal):
         Animal (BaseClass): See Animal Base Class for more information
     """
 
+    kind = "bugs"
+    __slots__ = ("surcharge", "rarity", "location")
+
     def __init__(self, api_response: dict, root_directory: str) -> None:
         super().__init__(api_response, root_directory)
-        self.surcharge = self._get_surcharge()
-        self.rarity = self._get_rarity()
-        self.location = self._get_location()
-        self.image_path = self._get_image_path()
+        self.surcharge = self._get_surcharge(api_response)
+        self.rarity = sys.intern(self._get_rarity(api_response))
+        self.location = sys.intern(self._get_location(api_response))
 
     def __str__(self):
         return f"""
@@ -146,22 +282,23 @@ class Bug(Animal):
         Price: {self.price}
         Surcharge: {self.surcharge}"""
 
-    def _get_surcharge(self):
-        if "price-flick" not in self.api_response:
+    def _get_surcharge(self, api_response: dict):
+        if "price-flick" not in api_response:
             raise KeyError("Key 'price-flick' not found")
-        return self.api_response["price-flick"]
+        return api_response["price-flick"]
 
-    def _get_rarity(self):
-        if "rarity" not in self.api_response["availability"]:
+    def _get_rarity(self, api_response: dict):
+        if "rarity" not in api_response["availability"]:
             raise KeyError("Key 'rarity' not found")
-        return self.api_response["availability"]["rarity"]
+        return api_response["availability"]["rarity"]
 
-    def _get_location(self):
-        if "location" not in self.api_response["availability"]:
+    def _get_location(self, api_response: dict):
+        if "location" not in api_response["availability"]:
             raise KeyError("Key 'location' not found")
-        return self.api_response["availability"]["location"]
+        return api_response["availability"]["location"]
 
-    def _get_image_path(self):
+    @property
+    def image_path(self):
         return f"{self.root_directory}/acnhanimaltracker/animals/images/bugs/{self.save_name}.png"
 
 
@@ -173,11 +310,13 @@ class SeaCreature(Animal):
         Animal (BaseClass): See Animal Base Class for more information
     """
 
+    kind = "sea_creatures"
+    __slots__ = ("speed", "shadow")
+
     def __init__(self, api_response: dict, root_directory: str) -> None:
         super().__init__(api_response, root_directory)
-        self.speed = self._get_speed()
-        self.shadow = self._get_shadow()
-        self.image_path = self._get_image_path()
+        self.speed = sys.intern(self._get_speed(api_response))
+        self.shadow = sys.intern(self._get_shadow(api_response))
 
     def __str__(self):
         return f"""
@@ -188,15 +327,16 @@ class SeaCreature(Animal):
         Months: {self.months}
         Price: {self.price}"""
 
-    def _get_shadow(self):
-        if "shadow" not in self.api_response:
+    def _get_shadow(self, api_response: dict):
+        if "shadow" not in api_response:
             raise KeyError("Key 'shadow' not found")
-        return self.api_response["shadow"]
+        return api_response["shadow"]
 
-    def _get_speed(self):
-        if "speed" not in self.api_response:
+    def _get_speed(self, api_response: dict):
+        if "speed" not in api_response:
             raise KeyError("Key 'speed' not found")
-        return self.api_response["speed"]
+        return api_response["speed"]
 
-    def _get_image_path(self):
+    @property
+    def image_path(self):
         return f"{self.root_directory}/acnhanimaltracker/animals/images/sea_creatures/{self.save_name}.png"
@@ -1,8 +1,26 @@
-import pickle
+import json
 import os
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from PIL import Image
+from ..profiling import profiler
 from .animal import Fish, Bug, SeaCreature
+from .animal_store import AnimalStore, content_hash, encode_api_response
+from .availability import AvailabilityIndex
+from .catalog import AnimalCatalog
+from .columnar import ColumnarCatalog, write_columnar_catalog
+from .change_tracker import ChangeTracker
+from .downloader import Downloader, DownloadError
+from .image_ingest import make_thumbnails, resize_pool, resize_to_width
+from .journal import ProgressJournal
+from .manifest import IntegrityReport, Manifest
+from .thumbnail_atlas import (
+    ThumbnailAtlas,
+    ThumbnailAtlasWriter,
+    migrate_image_directories,
+    thumbnail_key,
+)
 
 
 class AnimalHandler:
@@ -11,13 +29,21 @@ class AnimalHandler:
 
     Capable of:
     * sending out requests to the various endpoint from
-    https://acnhapi.com/v1/{endpoints}
+    https://acnhapi.com/v1/{endpoints} through a shared Downloader
     * resetting (redownloading) all data from the api, effectivly 'resetting'
     your progress
-    * loading all Animals from local storage into a list
+    * syncing the local catalog with the api while keeping your progress
+    * loading all Animals from local storage (see AnimalStore and
+    ColumnarCatalog) into a list
     Format: list[list[Fish], [Bug], [SeaCreature]]
     * saving all Animals with the current settings to local storage
+    * saving only the Animals changed since the last save, either on demand or
+    periodically in the background
+    * migrating the old one-pickle-per-animal directories into the store
+    * building an AvailabilityIndex to query all currently catchable Animals
+    * building an AnimalCatalog for indexed lookups and filter queries
     * downloading the associated images from the Animals and saving them
+    into the thumbnail atlas (see ThumbnailAtlas)
     """
 
     base_url = "https://acnhapi.com/v1/"
@@ -30,9 +56,27 @@ class AnimalHandler:
     directory_fish = "acnhanimaltracker/animals/animals/fish"
     directory_bugs = "acnhanimaltracker/animals/animals/bugs"
     directory_sea_creatures = "acnhanimaltracker/animals/animals/sea_creatures"
+    animal_directories = [
+        (Fish, directory_fish),
+        (Bug, directory_bugs),
+        (SeaCreature, directory_sea_creatures),
+    ]
+    animal_classes = {animal_class.kind: animal_class for animal_class, _ in animal_directories}
 
     def __init__(self, root_directory: str) -> None:
         self.root_directory = root_directory
+        self.store = AnimalStore(root_directory)
+        self.tracker = ChangeTracker()
+        self._autosave_thread = None
+        self._autosave_stop = threading.Event()
+        # Keeps a save from writing into a profile switched to meanwhile
+        self._save_lock = threading.RLock()
+        # Profile whose progress was loaded, saves always go there even if
+        # another process switches the active profile of the store
+        self.profile = None
+        self._profile_listeners = []
+        self.atlas_writer = None
+        self.downloader = Downloader()
 
     def send_request(self, endpoint: str) -> dict:
         """Sends out a request to the {endpoint}
@@ -45,9 +89,42 @@ class AnimalHandler:
             Returns:
                 dict: dictionary of a speficied animal
         """
-        response = requests.get(self.base_url + endpoint)
-        return response.json()
+        return self._request_endpoint(endpoint, conditional=False)[0]
 
+    def _request_endpoint(self, endpoint: str, conditional: bool) -> tuple[dict | None, dict[str, str]]:
+        """Requests an endpoint. With conditional=True the request carries
+        the stored ETag and Last-Modified header and None is returned if the
+        endpoint did not change since.
+
+        The new validators are only returned, not stored: the caller stores
+        them once the changes of the endpoint are completely applied, see
+        sync_animals.
+
+        Returns:
+            tuple[dict | None, dict[str, str]]: The json-response and the meta
+            entries of the validators of the response
+        """
+        headers = {}
+        if conditional:
+            etag = self.store.get_meta(f"etag:{endpoint}")
+            last_modified = self.store.get_meta(f"last-modified:{endpoint}")
+            if etag is not None:
+                headers["If-None-Match"] = etag
+            if last_modified is not None:
+                headers["If-Modified-Since"] = last_modified
+        response = self.downloader.get(
+            self.base_url + endpoint, content_type="application/json", headers=headers
+        )
+        if response.status_code == 304:
+            return None, {}
+        validators = {
+            f"{header.lower()}:{endpoint}": response.headers[header]
+            for header in ("ETag", "Last-Modified")
+            if header in response.headers
+        }
+        return response.json(), validators
+
+    @profiler.timed("reset_animals")
     def reset_animals(
         self, fish: bool = False, bug: bool = False, sea_creature: bool = False
     ) -> None:
@@ -65,87 +142,412 @@ class AnimalHandler:
             should be reset.
             Defaults to False.
         """
-        if fish:
-            response = self.send_request(self.fish_api_endpoint)
-            for key in response.keys():
-                fish_data = Fish(response[key], self.root_directory)
-                with open(
-                    f"{self.root_directory}/{self.directory_fish}/{fish_data.save_name}.pkl",
-                    "wb",
-                ) as file_handler:
-                    pickle.dump(fish_data, file_handler)
-
-        if bug:
-            response = self.send_request(self.bug_api_endpoint)
-            for key in response.keys():
-                bug_data = Bug(response[key], self.root_directory)
-                with open(
-                    f"{self.root_directory}/{self.directory_bugs}/{bug_data.save_name}.pkl",
-                    "wb",
-                ) as file_handler:
-                    pickle.dump(bug_data, file_handler)
-
-        if sea_creature:
-            response = self.send_request(self.sea_api_endpoint)
-            for key in response.keys():
-                sea_creature_data = SeaCreature(response[key], self.root_directory)
-                with open(
-                    f"{self.root_directory}/{self.directory_sea_creatures}/{sea_creature_data.save_name}.pkl",
-                    "wb",
-                ) as file_handler:
-                    pickle.dump(sea_creature_data, file_handler)
-
-    def load_animals(self) -> list[list[Fish | Bug | SeaCreature]]:
-        """Loads all animals from local storage into a list
+        for reset, animal_class, endpoint in [
+            (fish, Fish, self.fish_api_endpoint),
+            (bug, Bug, self.bug_api_endpoint),
+            (sea_creature, SeaCreature, self.sea_api_endpoint),
+        ]:
+            if not reset:
+                continue
+            response = self.send_request(endpoint)
+            api_responses = list(response.values())
+            save_names = [
+                animal_class(api_response, self.root_directory).save_name
+                for api_response in api_responses
+            ]
+            self.store.replace_kind(animal_class.kind, api_responses, save_names)
+
+    @profiler.timed("sync_animals")
+    def sync_animals(
+        self,
+        animal_list: list[list[Fish | Bug | SeaCreature]] | None = None,
+        download_images: bool = True,
+    ) -> tuple[list[Fish | Bug | SeaCreature], list[Fish | Bug | SeaCreature]]:
+        """Updates the local catalog from the API without touching your
+        progress. Endpoints which did not change since the last request
+        (ETag/If-Modified-Since) are skipped entirely. Otherwise every animal
+        is compared by id and content hash: new species are added, changed
+        ones are updated and unchanged ones are left alone. The caught status
+        is never modified. Only the images of new species and of animals
+        with a new image url are downloaded.
+
+        The images are downloaded before the store is written. An animal
+        whose new image could not be downloaded is left out of the store and
+        keeps its old version in animal_list, so the next sync finds it
+        changed again and retries it. The validators
+        of an endpoint (ETag/Last-Modified) are stored in the same
+        transaction as its animals, and only if every change of the
+        endpoint was applied.
+
+        Args:
+            animal_list (list[list[Fish  |  Bug  |  SeaCreature]], optional):
+            Already loaded animals, which are updated in place. New species
+            are appended to their list. Defaults to None.
+            download_images (bool, optional): Download the changed images.
+            Without it all changes are stored and the changed images are
+            left to verify_integrity and repair. Defaults to True.
+
+        Returns:
+            tuple[list, list]: The added and the updated animals
+        """
+        loaded = {}
+        if animal_list is not None:
+            loaded = {(animal.kind, animal.id): animal for animal_type in animal_list for animal in animal_type}
+        added = []
+        updated = []
+        new_images = []
+        # Animals whose stored thumbnail shows an old image
+        outdated_images = []
+        fetched = []
+        for index, (animal_class, endpoint) in enumerate(
+            [
+                (Fish, self.fish_api_endpoint),
+                (Bug, self.bug_api_endpoint),
+                (SeaCreature, self.sea_api_endpoint),
+            ]
+        ):
+            response, validators = self._request_endpoint(endpoint, conditional=True)
+            if response is None:
+                continue
+            stored = self.store.load_hashes(animal_class.kind)
+            changed = [
+                api_response
+                for api_response in response.values()
+                if api_response["id"] not in stored
+                or stored[api_response["id"]][0] != content_hash(encode_api_response(api_response))
+            ]
+            # Loaded animals are only updated once their new version is
+            # stored, until then the images are fetched for a staged copy
+            animals = []
+            for api_response in changed:
+                animal = animal_class(api_response, self.root_directory)
+                if api_response["id"] in stored:
+                    if json.loads(stored[api_response["id"]][1]).get("image_uri") != animal.image_url:
+                        new_images.append(animal)
+                        outdated_images.append(animal)
+                else:
+                    animal.tracker = self.tracker
+                    new_images.append(animal)
+                animals.append(animal)
+            fetched.append((index, animal_class, validators, stored, changed, animals))
+
+        missing_images = []
+        if download_images and new_images:
+            with self.open_atlas_writer():
+                missing_images = self.download_all_images(new_images, force=True)
+        elif outdated_images:
+            # New species have no thumbnail yet, only the outdated ones
+            # have to be marked
+            Manifest(self.root_directory).mark_outdated(
+                thumbnail_key(animal.kind, animal.save_name) for animal in outdated_images
+            )
+        missing = {(animal.kind, animal.id) for animal in missing_images}
+
+        for index, animal_class, validators, stored, changed, animals in fetched:
+            complete = [
+                (api_response, animal)
+                for api_response, animal in zip(changed, animals)
+                if (animal.kind, animal.id) not in missing
+            ]
+            self.store.upsert(
+                animal_class.kind,
+                [api_response for api_response, _ in complete],
+                [animal.save_name for _, animal in complete],
+                validators if len(complete) == len(changed) else None,
+            )
+            for api_response, animal in complete:
+                if api_response["id"] in stored:
+                    loaded_animal = loaded.get((animal.kind, animal.id))
+                    if loaded_animal is not None:
+                        loaded_animal.update(api_response)
+                        animal = loaded_animal
+                    updated.append(animal)
+                else:
+                    if animal_list is not None:
+                        animal_list[index].append(animal)
+                    added.append(animal)
+        return added, updated
+
+    @profiler.timed("load_animals")
+    def load_animals(self, profile: str | None = None) -> list[list[Fish | Bug | SeaCreature]]:
+        """Loads all animals from local storage into a list. If the store is
+        still empty, the animals are migrated once from the old pickle
+        directories.
+
+        The static catalog is read from the ColumnarCatalog if it matches the
+        current catalog revision of the store, otherwise it is rebuilt from
+        the store. Only the caught states are always read from the store.
+
+        Args:
+            profile (str, optional): Profile whose progress is loaded and
+            later saved. Defaults to the active profile of the store.
 
         Returns:
             list[list[Fish | Bug | SeaCreature]]: Loads all Animals into a list
         """
-        animal_list = []
+        self.profile = profile or self.store.active_profile()
+        revision = self.store.catalog_revision()
+        animal_list = None
+        columns = ColumnarCatalog.open(self.root_directory)
+        if columns is not None:
+            # Closed before write_columnar_catalog replaces the file
+            with columns:
+                if columns.revision == revision and revision:
+                    animal_list = columns.animals()
+        if animal_list is not None:
+            caught = self.store.load_caught(self.profile)
+            for animal_type in animal_list:
+                for animal_data in animal_type:
+                    animal_data.caught = (animal_data.kind, animal_data.id) in caught
+                    animal_data.tracker = self.tracker
+            return animal_list
 
-        for directory in [
-            self.directory_fish,
-            self.directory_bugs,
-            self.directory_sea_creatures,
-        ]:
-            temp_list = []
-            for file in os.listdir(f"{self.root_directory}/{directory}"):
-                with open(
-                    f"{self.root_directory}/{directory}/{file}", "rb"
-                ) as file_handler:
-                    animal_data = pickle.load(file_handler)
-                    temp_list.append(animal_data)
-            temp_list.sort(key=lambda animal: animal.id)
-            animal_list.append(temp_list)
+        if self.store.is_empty():
+            self.store.migrate_pickles(
+                {
+                    animal_class.kind: f"{self.root_directory}/{directory}"
+                    for animal_class, directory in self.animal_directories
+                }
+            )
+
+        animals_by_kind = {animal_class.kind: [] for animal_class, _ in self.animal_directories}
+        for kind, api_response, caught in self.store.load(self.profile):
+            animal_data = self.animal_classes[kind](api_response, self.root_directory)
+            animal_data.caught = caught
+            animal_data.tracker = self.tracker
+            animals_by_kind[kind].append(animal_data)
+        animal_list = [animals_by_kind[animal_class.kind] for animal_class, _ in self.animal_directories]
+        write_columnar_catalog(
+            f"{self.root_directory}/{ColumnarCatalog.file_name}",
+            (animal for animal_type in animal_list for animal in animal_type),
+            self.store.catalog_revision(),
+        )
         return animal_list
 
+    @profiler.timed("save_animals")
     def save_animals(self, animal_list: list[list[Fish | Bug | SeaCreature]]) -> None:
-        """Saves current progress and changes to Animals
+        """Saves current progress and changes to Animals in one transaction
 
         Args:
             animal_list (list[list[Fish  |  Bug  |  SeaCreature]]):
             The list you get from self.load_animals
         """
-        for animal_type in animal_list:
-            for animal in animal_type:
-                if isinstance(animal, Fish):
-                    with open(
-                        f"{self.root_directory}/{self.directory_fish}/{animal.save_name}.pkl",
-                        "wb",
-                    ) as file_handler:
-                        pickle.dump(animal, file_handler)
-                if isinstance(animal, Bug):
-                    with open(
-                        f"{self.root_directory}/{self.directory_bugs}/{animal.save_name}.pkl",
-                        "wb",
-                    ) as file_handler:
-                        pickle.dump(animal, file_handler)
-                if isinstance(animal, SeaCreature):
-                    with open(
-                        f"{self.root_directory}/{self.directory_sea_creatures}/{animal.save_name}.pkl",
-                        "wb",
-                    ) as file_handler:
-                        pickle.dump(animal, file_handler)
+        with self._save_lock:
+            self.store.save_caught(
+                [
+                    (animal.kind, animal.id, animal.caught)
+                    for animal_type in animal_list
+                    for animal in animal_type
+                ],
+                self.profile,
+            )
+            self.tracker.drain()
+
+    @profiler.timed("save_changes")
+    def save_changes(self) -> int:
+        """Saves only the Animals whose caught status changed since the last
+        save in one transaction.
+
+        Returns:
+            int: Number of saved Animals
+        """
+        with self._save_lock:
+            changed = self.tracker.drain()
+            if not changed:
+                return 0
+            try:
+                self.store.save_caught(
+                    [(animal.kind, animal.id, animal.caught) for animal in changed], self.profile
+                )
+            except Exception:
+                for animal in changed:
+                    self.tracker.mark(animal)
+                raise
+            return len(changed)
+
+    def switch_profile(
+        self,
+        name: str,
+        animal_list: list[list[Fish | Bug | SeaCreature]],
+        create: bool = False,
+        persist: bool = True,
+    ) -> int:
+        """Saves the pending changes of the loaded profile, switches to the
+        profile {name} and applies its progress to the loaded Animals. The
+        catalog and the images are not reloaded. Indexes subscribed to the
+        tracker are updated for every Animal whose caught status differs,
+        listeners registered via subscribe_profile are notified afterwards.
+
+        Args:
+            name (str): Name of the profile
+            animal_list (list[list[Fish  |  Bug  |  SeaCreature]]):
+            The list you get from self.load_animals
+            create (bool, optional): Create the profile if it does not exist.
+            Defaults to False.
+            persist (bool, optional): Also make {name} the active profile of
+            the store, which the next start opens. Defaults to True.
+
+        Raises:
+            ValueError: If there is no such profile and create is False
+
+        Returns:
+            int: Number of Animals whose caught status changed
+        """
+        with self._save_lock:
+            if name not in self.store.profiles():
+                if not create:
+                    raise ValueError(f"There is no profile {name}")
+                self.store.create_profile(name)
+            # The journal must not hold records of the old profile afterwards
+            self.compact_journal(name)
+            if persist:
+                self.store.switch_profile(name)
+            self.profile = name
+            caught = self.store.load_caught(name)
+            changed = 0
+            for animal_type in animal_list:
+                for animal in animal_type:
+                    is_caught = (animal.kind, animal.id) in caught
+                    if animal.caught != is_caught:
+                        animal.caught = is_caught
+                        self.tracker.notify(animal)
+                        changed += 1
+        for listener in self._profile_listeners:
+            listener(name)
+        return changed
+
+    def subscribe_profile(self, listener) -> None:
+        """Registers a callable that is called after every profile switch.
+
+        Args:
+            listener (Callable[[str], None]): The callback, called with the
+            name of the new profile
+        """
+        self._profile_listeners.append(listener)
+
+    def open_journal(self, animal_list: list[list[Fish | Bug | SeaCreature]]) -> int:
+        """Records every further change of the loaded Animals in a
+        ProgressJournal, so no change is lost if the process dies before the
+        next save, and replays the journals left by earlier sessions. Changes
+        of the loaded profile are applied to the loaded Animals, those of
+        other profiles are saved into their profile directly. The replayed
+        changes are compacted into the store in a background thread.
+
+        Args:
+            animal_list (list[list[Fish  |  Bug  |  SeaCreature]]):
+            The list you get from self.load_animals
+
+        Returns:
+            int: Number of replayed changes
+        """
+        self.profile = self.profile or self.store.active_profile()
+        journal = ProgressJournal(self.root_directory, self.animal_classes, self.profile)
+        journal.open()
+        self.tracker.journal = journal
+        loaded = {(animal.kind, animal.id): animal for animal_type in animal_list for animal in animal_type}
+
+        def restore(profile: str, states: dict[tuple[str, int], bool]) -> None:
+            if profile == self.profile:
+                for key, caught in states.items():
+                    if key in loaded:
+                        loaded[key].set_caught_status(caught)
+            elif profile in self.store.profiles():
+                self.store.save_caught(
+                    [(kind, animal_id, caught) for (kind, animal_id), caught in states.items()], profile
+                )
+
+        replayed = journal.recover(restore)
+        threading.Thread(target=self.compact_journal, daemon=True).start()
+        return replayed
+
+    def compact_journal(self, profile: str | None = None) -> int:
+        """Saves the changed Animals (see save_changes) and drops the
+        journal records saved by it.
+
+        Args:
+            profile (str, optional): Profile of the records appended from
+            now on, see switch_profile. Defaults to the current one.
+
+        Returns:
+            int: Number of saved Animals
+        """
+        with self._save_lock:
+            if self.tracker.journal is None:
+                return self.save_changes()
+            return self.tracker.journal.compact(self.save_changes, profile)
+
+    def close_journal(self) -> None:
+        """Saves all pending changes and removes the journal."""
+        with self._save_lock:
+            journal, self.tracker.journal = self.tracker.journal, None
+            if journal is not None:
+                journal.close(self.save_changes)
+
+    def start_autosave(self, interval: float = 10.0) -> None:
+        """Starts a background thread saving the changed Animals every
+        {interval} seconds, which also keeps the journal short (see
+        compact_journal).
+
+        Args:
+            interval (float, optional): Seconds between two saves.
+            Defaults to 10.0.
+        """
+        if self._autosave_thread is not None:
+            return
+        self._autosave_stop.clear()
+
+        def autosave():
+            while not self._autosave_stop.wait(interval):
+                # A failed save (e.g. the store is locked by cli.py) keeps
+                # its changes marked and is retried on the next tick
+                try:
+                    self.compact_journal()
+                except Exception as error:
+                    print(f"Could not save the progress, retrying in {interval} seconds: {error}")
+
+        self._autosave_thread = threading.Thread(target=autosave, daemon=True)
+        self._autosave_thread.start()
+
+    def stop_autosave(self) -> None:
+        """Stops the background thread and saves all pending changes."""
+        if self._autosave_thread is not None:
+            self._autosave_stop.set()
+            self._autosave_thread.join()
+            self._autosave_thread = None
+        self.save_changes()
+
+    def build_availability_index(
+        self, animal_list: list[list[Fish | Bug | SeaCreature]]
+    ) -> AvailabilityIndex:
+        """Builds an AvailabilityIndex over all Animals which keeps track of
+        every caught status change.
+
+        Args:
+            animal_list (list[list[Fish  |  Bug  |  SeaCreature]]):
+            The list you get from self.load_animals
+
+        Returns:
+            AvailabilityIndex: Index to query all catchable Animals
+        """
+        return AvailabilityIndex(
+            (animal for animal_type in animal_list for animal in animal_type), self.tracker
+        )
+
+    @profiler.timed("build_catalog")
+    def build_catalog(
+        self, animal_list: list[list[Fish | Bug | SeaCreature]]
+    ) -> AnimalCatalog:
+        """Builds an AnimalCatalog over all Animals which keeps track of every
+        caught status change.
+
+        Args:
+            animal_list (list[list[Fish  |  Bug  |  SeaCreature]]):
+            The list you get from self.load_animals
+
+        Returns:
+            AnimalCatalog: Indexed catalog of all Animals
+        """
+        return AnimalCatalog(animal_list, self.tracker)
 
     def download_images(
         self, animal_list: list[list[Fish | Bug | SeaCreature]]
@@ -158,95 +560,203 @@ class AnimalHandler:
         """
         for animal_type in animal_list:
             for animal in animal_type:
-                response = requests.get(animal.image_url)
-                if isinstance(animal, Fish):
-                    with open(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/fish/{animal.save_name}.png",
-                        "wb",
-                    ) as file_handler:
-                        file_handler.write(response.content)
-                    image = Image.open(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/fish/{animal.save_name}.png"
-                    )
-                    image = self.resize_image(image)
-                    image.save(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/fish/{animal.save_name}.png"
-                    )
-
-                if isinstance(animal, Bug):
-                    with open(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/bugs/{animal.save_name}.png",
-                        "wb",
-                    ) as file_handler:
-                        file_handler.write(response.content)
-                    image = Image.open(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/bugs/{animal.save_name}.png"
-                    )
-                    image = self.resize_image(image)
-                    image.save(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/bugs/{animal.save_name}.png"
-                    )
-                if isinstance(animal, SeaCreature):
-                    with open(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/sea_creatures/{animal.save_name}.png",
-                        "wb",
-                    ) as file_handler:
-                        file_handler.write(response.content)
-                    image = Image.open(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/sea_creatures/{animal.save_name}.png"
-                    )
-                    image = self.resize_image(image)
-                    image.save(
-                        f"{self.root_directory}/acnhanimaltracker/animals/images/sea_creatures/{animal.save_name}.png"
-                    )
+                self.download_animal_images(animal)
+
+    @contextmanager
+    def open_atlas_writer(self):
+        """Context manager opening a writer for the thumbnail atlas. While it
+        is open, all downloaded images are written into the atlas instead of
+        single files. Existing thumbnails are kept, the atlas is replaced on
+        exit.
+
+        The atlas is written even if the download fails or is interrupted,
+        so every finished thumbnail is kept and a later download_all_images
+        resumes where it stopped. The Manifest is rewritten afterwards.
+
+        Yields:
+            ThumbnailAtlasWriter: The writer used by download_animal_images
+        """
+        writer = ThumbnailAtlasWriter(
+            f"{self.root_directory}/{ThumbnailAtlas.file_name}",
+            ThumbnailAtlas.open(self.root_directory),
+        )
+        self.atlas_writer = writer
+        try:
+            yield writer
+        finally:
+            self.atlas_writer = None
+            writer.close()
+            self.write_manifest()
+
+    def write_manifest(self) -> None:
+        """Records the current thumbnail atlas in the Manifest."""
+        Manifest(self.root_directory).record_atlas()
+
+    @profiler.timed("verify_integrity")
+    def verify_integrity(
+        self, animal_list: list[list[Fish | Bug | SeaCreature]], deep: bool = False
+    ) -> IntegrityReport:
+        """Checks that every kind has animals and every animal a thumbnail
+        matching the Manifest. Without deep this usually only stats the
+        atlas, see Manifest.verify.
+
+        Args:
+            animal_list (list[list[Fish  |  Bug  |  SeaCreature]]):
+            The list you get from self.load_animals
+            deep (bool, optional): Also compare the hash of every thumbnail.
+            Defaults to False.
+
+        Returns:
+            IntegrityReport: What needs to be repaired
+        """
+        return Manifest(self.root_directory).verify(self, animal_list, deep)
+
+    @profiler.timed("repair")
+    def repair(
+        self, animal_list: list[list[Fish | Bug | SeaCreature]], report: IntegrityReport
+    ) -> list[list[Fish | Bug | SeaCreature]]:
+        """Fetches only what the report found missing or corrupt: missing
+        kinds are downloaded from the API again, missing or corrupt
+        thumbnails are downloaded again. The progress of the other kinds is
+        kept.
+
+        Args:
+            animal_list (list[list[Fish  |  Bug  |  SeaCreature]]):
+            The list you get from self.load_animals
+            report (IntegrityReport): The result of self.verify_integrity
+
+        Returns:
+            list[list[Fish | Bug | SeaCreature]]: The animal_list, reloaded
+            if kinds were missing
+        """
+        if report.missing_kinds:
+            self.reset_animals(
+                *(animal_class.kind in report.missing_kinds for animal_class, _ in self.animal_directories)
+            )
+            animal_list = self.load_animals()
+            # The thumbnails of the new animals are missing as well
+            report = self.verify_integrity(animal_list)
+        damaged = report.missing + report.corrupt
+        if damaged:
+            with self.open_atlas_writer():
+                failed = self.download_all_images(damaged, force=True)
+            if failed:
+                print(f"{len(failed)} images could not be repaired, retrying on the next start")
+        return animal_list
+
+    def start_deep_verification(self, animal_list: list[list[Fish | Bug | SeaCreature]]) -> None:
+        """Hashes every thumbnail in a background thread (see
+        verify_integrity). Damaged thumbnails are remembered in the Manifest
+        and repaired on the next start, never while the atlas is in use.
+
+        Args:
+            animal_list (list[list[Fish  |  Bug  |  SeaCreature]]):
+            The list you get from self.load_animals
+        """
+
+        def verify():
+            report = self.verify_integrity(animal_list, deep=True)
+            if report.corrupt:
+                print(f"Found {len(report.corrupt)} damaged images, repairing them on the next start")
+
+        threading.Thread(target=verify, daemon=True).start()
+
+    def migrate_images(self) -> int:
+        """One-time migration of the images/<kind>/ directories into the
+        thumbnail atlas.
+
+        Returns:
+            int: Number of migrated thumbnails
+        """
+        return migrate_image_directories(self.root_directory)
 
     def download_animal_images(self, animal: Fish | Bug | SeaCreature):
-        """Download and save all images the animals from the animal_list.
+        """Download and save the image of an animal, either into the atlas
+        (see open_atlas_writer) or as single file.
 
         Args:
             animal (Fish  |  Bug  |  SeaCreature):
         """
-        response = requests.get(animal.image_url)
-        if isinstance(animal, Fish):
-            with open(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/fish/{animal.save_name}.png",
-                "wb",
-            ) as file_handler:
-                file_handler.write(response.content)
-            image = Image.open(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/fish/{animal.save_name}.png"
-            )
-            image = self.resize_image(image)
-            image.save(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/fish/{animal.save_name}.png"
-            )
+        self._write_thumbnails(animal, make_thumbnails(self._fetch_image(animal)))
 
-        if isinstance(animal, Bug):
-            with open(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/bugs/{animal.save_name}.png",
-                "wb",
-            ) as file_handler:
-                file_handler.write(response.content)
-            image = Image.open(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/bugs/{animal.save_name}.png"
-            )
-            image = self.resize_image(image)
-            image.save(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/bugs/{animal.save_name}.png"
-            )
-        if isinstance(animal, SeaCreature):
-            with open(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/sea_creatures/{animal.save_name}.png",
-                "wb",
-            ) as file_handler:
-                file_handler.write(response.content)
-            image = Image.open(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/sea_creatures/{animal.save_name}.png"
-            )
-            image = self.resize_image(image)
-            image.save(
-                f"{self.root_directory}/acnhanimaltracker/animals/images/sea_creatures/{animal.save_name}.png"
-            )
+    def download_all_images(
+        self,
+        animals: list[Fish | Bug | SeaCreature],
+        download_workers: int = 16,
+        resize_workers: int | None = None,
+        force: bool = False,
+    ) -> list[Fish | Bug | SeaCreature]:
+        """Downloads the images of all animals in threads and fans resizing
+        and encoding out to a process pool. Every image is decoded from
+        memory once and its thumbnails (see THUMBNAIL_WIDTHS) written exactly
+        once. Animals which already
+        have a thumbnail (see has_thumbnail) are skipped, so an interrupted
+        download resumes where it stopped.
+
+        Args:
+            animals (list[Fish  |  Bug  |  SeaCreature]): Animals of any kind
+            download_workers (int, optional): Concurrent downloads, also
+            limited by self.downloader. Defaults to 16.
+            resize_workers (int | None, optional): Processes resizing images.
+            Defaults to None (one per CPU).
+            force (bool, optional): Also replace existing thumbnails.
+            Defaults to False.
+
+        Returns:
+            list[Fish | Bug | SeaCreature]: Animals whose image could not be
+            downloaded or decoded
+        """
+        missing = [animal for animal in animals if force or not self.has_thumbnail(animal)]
+        failed = []
+        with ThreadPoolExecutor(download_workers) as downloads, resize_pool(resize_workers) as resizes:
+            downloaded = {downloads.submit(self._fetch_image, animal): animal for animal in missing}
+            resized = {}
+            for future in as_completed(downloaded):
+                try:
+                    data = future.result()
+                except DownloadError as error:
+                    print(f"Could not download the image of {downloaded[future].name}: {error}")
+                    failed.append(downloaded[future])
+                    continue
+                resized[resizes.submit(make_thumbnails, data)] = downloaded[future]
+            for future in as_completed(resized):
+                try:
+                    thumbnails = future.result()
+                except Exception as error:
+                    # e.g. PIL.UnidentifiedImageError if the body is no image
+                    print(f"Could not resize the image of {resized[future].name}: {error}")
+                    failed.append(resized[future])
+                    continue
+                self._write_thumbnails(resized[future], thumbnails)
+        return failed
+
+    def has_thumbnail(self, animal: Fish | Bug | SeaCreature) -> bool:
+        """Checks if the thumbnail of an animal is already stored, either in
+        the atlas being written or as single file.
+
+        Args:
+            animal (Fish  |  Bug  |  SeaCreature):
+        """
+        if self.atlas_writer is not None and thumbnail_key(animal.kind, animal.save_name) in self.atlas_writer:
+            return True
+        return os.path.exists(animal.image_path)
+
+    def _fetch_image(self, animal: Fish | Bug | SeaCreature) -> bytes:
+        return self.downloader.get_image(animal.image_url)
+
+    def _write_thumbnails(
+        self, animal: Fish | Bug | SeaCreature, thumbnails: dict[int, tuple[bytes, int, int]]
+    ) -> None:
+        for thumbnail_width, (data, width, height) in thumbnails.items():
+            key = thumbnail_key(animal.kind, animal.save_name, thumbnail_width)
+            if self.atlas_writer is not None:
+                self.atlas_writer.add(key, data, width, height)
+                continue
+            # Rename a complete file into place so a crash never leaves a half written image
+            path = f"{self.root_directory}/acnhanimaltracker/animals/images/{key}.png"
+            with open(f"{path}.tmp", "wb") as file_handler:
+                file_handler.write(data)
+            os.replace(f"{path}.tmp", path)
 
     def resize_image(self, image: Image.Image):
         """Resizes an image to a specified width respecting the aspect ratio.
@@ -257,8 +767,4 @@ class AnimalHandler:
         Returns:
             Image.Image: Return a resized version of an image given
         """
-        basewidth = 250
-        wpercent = basewidth / float(image.size[0])
-        hsize = int((float(image.size[1] * float(wpercent))))
-        image = image.resize((basewidth, hsize), Image.ANTIALIAS)
-        return image
+        return resize_to_width(image)
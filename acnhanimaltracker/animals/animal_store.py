@@ -0,0 +1,475 @@
+import functools
+import hashlib
+import json
+import operator
+import os
+import pickle
+import sqlite3
+import uuid
+from . import bitset
+
+DEFAULT_PROFILE = "default"
+
+
+def encode_api_response(api_response: dict) -> str:
+    """Canonical json text of an api_response as stored in the AnimalStore."""
+    return json.dumps(api_response, sort_keys=True, separators=(",", ":"))
+
+
+def content_hash(data: str) -> str:
+    """Hash of the canonical json text of an api_response, see
+    encode_api_response."""
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+class _LegacyAnimal:
+    """Stand-in for the pickled Fish, Bug and SeaCreature objects of the old
+    one-file-per-animal layout. Unpickling into this class gives access to the
+    raw attributes, independent of the current layout of animal.py."""
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if module.startswith("acnhanimaltracker.animals"):
+            return _LegacyAnimal
+        return super().find_class(module, name)
+
+
+class AnimalStore:
+    """Single-file SQLite storage holding the whole animal catalog together
+    with the progress of one or more profiles (players or islands).
+
+    Every animal is one row keyed by (kind, id) containing the json-response
+    of the API. The catalog is shared by all profiles. The progress of a
+    profile is one bitset per kind in which bit n is set if the animal with
+    id n is caught. Loading is a single query and every write is committed in
+    one transaction, so a crash while saving never leaves a mix of old and
+    new progress behind.
+
+    Methods without a profile argument read and write the progress of the
+    active profile, see switch_profile.
+
+    Args:
+        root_directory (str): The root directory created in main.py
+    """
+
+    file_name = "acnhanimaltracker/animals/animals.db"
+
+    def __init__(self, root_directory: str) -> None:
+        self.root_directory = root_directory
+        self.path = os.path.join(root_directory, self.file_name)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS animals (
+                kind TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                save_name TEXT NOT NULL,
+                data TEXT NOT NULL,
+                -- Progress of stores created before profiles, see progress
+                caught INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, id)
+            )"""
+        )
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        connection.execute("CREATE TABLE IF NOT EXISTS profiles (name TEXT PRIMARY KEY)")
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS progress (
+                profile TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                caught BLOB NOT NULL,
+                PRIMARY KEY (profile, kind)
+            )"""
+        )
+        if connection.execute("SELECT 1 FROM profiles LIMIT 1").fetchone() is None:
+            # Stores of older versions kept the single progress in animals.caught
+            with connection:
+                connection.execute("INSERT INTO profiles (name) VALUES (?)", (DEFAULT_PROFILE,))
+                rows = connection.execute("SELECT kind, id FROM animals WHERE caught = 1").fetchall()
+                self._write_caught(connection, DEFAULT_PROFILE, [(kind, animal_id, True) for kind, animal_id in rows])
+        return connection
+
+    def _read_bits(self, connection: sqlite3.Connection, profile: str) -> dict[str, int]:
+        return {
+            kind: int.from_bytes(caught, "little")
+            for kind, caught in connection.execute(
+                "SELECT kind, caught FROM progress WHERE profile = ?", (profile,)
+            )
+        }
+
+    def _write_bits(self, connection: sqlite3.Connection, profile: str, bits: dict[str, int]) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO progress (profile, kind, caught) VALUES (?, ?, ?)",
+            [
+                (profile, kind, value.to_bytes((value.bit_length() + 7) // 8, "little"))
+                for kind, value in bits.items()
+            ],
+        )
+
+    def _write_caught(
+        self, connection: sqlite3.Connection, profile: str, entries: list[tuple[str, int, bool]]
+    ) -> None:
+        bits = self._read_bits(connection, profile)
+        changed = {}
+        for kind, animal_id, caught in entries:
+            value = changed.get(kind, bits.get(kind, 0))
+            changed[kind] = value | 1 << animal_id if caught else value & ~(1 << animal_id)
+        self._write_bits(connection, profile, changed)
+
+    def _bump_revision(self, connection: sqlite3.Connection) -> None:
+        # Random instead of a counter: a recreated animals.db would count up
+        # to the revision of an old ColumnarCatalog file again
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('catalog_revision', ?)",
+            (str(uuid.uuid4().int >> 65 or 1),),
+        )
+
+    def catalog_revision(self) -> int:
+        """Returns a random, non-zero 63 bit number which changes with every
+        write to the catalog (not to the caught states), 0 before the first
+        write. Used to detect outdated ColumnarCatalog files, also ones left
+        from a deleted or recreated store.
+        """
+        return int(self.get_meta("catalog_revision") or 0)
+
+    def is_empty(self) -> bool:
+        """Checks if the store holds any animals at all.
+
+        Returns:
+            bool: True if the store file is missing or has no animals
+        """
+        if not os.path.exists(self.path):
+            return True
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT 1 FROM animals LIMIT 1").fetchone() is None
+        finally:
+            connection.close()
+
+    def load(self, profile: str | None = None) -> list[tuple[str, dict, bool]]:
+        """Reads the whole catalog in one query.
+
+        Args:
+            profile (str, optional): Profile whose caught states are read.
+            Defaults to the active profile.
+
+        Returns:
+            list[tuple[str, dict, bool]]: (kind, api_response, caught) for every
+            animal, sorted by kind and id
+        """
+        connection = self._connect()
+        try:
+            bits = self._read_bits(connection, profile or self._active_profile(connection))
+            rows = connection.execute("SELECT kind, id, data FROM animals ORDER BY kind, id").fetchall()
+        finally:
+            connection.close()
+        return [
+            (kind, json.loads(data), bool(bits.get(kind, 0) >> animal_id & 1))
+            for kind, animal_id, data in rows
+        ]
+
+    def load_caught(self, profile: str | None = None) -> set[tuple[str, int]]:
+        """Reads the (kind, id) of every caught animal of a profile.
+
+        Args:
+            profile (str, optional): Defaults to the active profile.
+        """
+        return {
+            (kind, animal_id)
+            for kind, value in self.load_caught_bits(profile).items()
+            for animal_id in bitset.to_positions(value)
+        }
+
+    def load_caught_bits(self, profile: str | None = None) -> dict[str, int]:
+        """Reads the progress bitsets of a profile.
+
+        Args:
+            profile (str, optional): Defaults to the active profile.
+
+        Returns:
+            dict[str, int]: Maps every kind to a bitset of the caught ids
+        """
+        connection = self._connect()
+        try:
+            return self._read_bits(connection, profile or self._active_profile(connection))
+        finally:
+            connection.close()
+
+    def replace_kind(self, kind: str, api_responses: list[dict], save_names: list[str]) -> None:
+        """Replaces every animal of one kind with a freshly downloaded catalog.
+        All caught states of this kind are reset for the active profile.
+
+        Args:
+            kind (str): The kind of the animals (e.g.: "fish")
+            api_responses (list[dict]): The json-responses of every animal
+            save_names (list[str]): The save_name of every animal
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM animals WHERE kind = ?", (kind,))
+                self._bump_revision(connection)
+                connection.executemany(
+                    "INSERT INTO animals (kind, id, save_name, data, caught) VALUES (?, ?, ?, ?, 0)",
+                    [
+                        (kind, api_response["id"], save_name, encode_api_response(api_response))
+                        for api_response, save_name in zip(api_responses, save_names)
+                    ],
+                )
+                self._write_bits(connection, self._active_profile(connection), {kind: 0})
+        finally:
+            connection.close()
+
+    def load_hashes(self, kind: str) -> dict[int, tuple[str, str]]:
+        """Returns the content_hash of every stored animal of one kind along
+        with its stored json text.
+
+        Args:
+            kind (str): The kind of the animals (e.g.: "fish")
+
+        Returns:
+            dict[int, tuple[str, str]]: Maps the id of every animal to its
+            content hash and json text
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT id, data FROM animals WHERE kind = ?", (kind,)).fetchall()
+        finally:
+            connection.close()
+        return {animal_id: (content_hash(data), data) for animal_id, data in rows}
+
+    def upsert(
+        self, kind: str, api_responses: list[dict], save_names: list[str], meta: dict[str, str] | None = None
+    ) -> None:
+        """Adds new animals and updates the data of existing ones in one
+        transaction. The caught state of existing animals is kept. The
+        catalog revision only changes if there are animals to write.
+
+        Args:
+            kind (str): The kind of the animals (e.g.: "fish")
+            api_responses (list[dict]): The json-responses of the animals
+            save_names (list[str]): The save_name of every animal
+            meta (dict[str, str], optional): Metadata values written in the
+            same transaction (e.g.: the ETag of the endpoint). Defaults to
+            None.
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                if meta:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", list(meta.items())
+                    )
+                if not api_responses:
+                    # Nothing changed, the ColumnarCatalog stays valid
+                    return
+                self._bump_revision(connection)
+                connection.executemany(
+                    """INSERT INTO animals (kind, id, save_name, data, caught) VALUES (?, ?, ?, ?, 0)
+                    ON CONFLICT (kind, id) DO UPDATE SET save_name = excluded.save_name, data = excluded.data""",
+                    [
+                        (kind, api_response["id"], save_name, encode_api_response(api_response))
+                        for api_response, save_name in zip(api_responses, save_names)
+                    ],
+                )
+        finally:
+            connection.close()
+
+    def get_meta(self, key: str) -> str | None:
+        """Returns a stored metadata value (e.g.: the ETag of an endpoint)."""
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        finally:
+            connection.close()
+        return None if row is None else row[0]
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Stores a metadata value (e.g.: the ETag of an endpoint)."""
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+        finally:
+            connection.close()
+
+    def save_caught(self, entries: list[tuple[str, int, bool]], profile: str | None = None) -> None:
+        """Writes the caught state of the given animals in one transaction.
+
+        The bitsets are read and written under the write lock of the
+        database (BEGIN IMMEDIATE), so concurrent writers (e.g. the autosave
+        of the GUI and a cli.py run) never overwrite each other's changes.
+
+        Args:
+            entries (list[tuple[str, int, bool]]): (kind, id, caught) per animal
+            profile (str, optional): Defaults to the active profile. Pass the
+            loaded profile, another process may switch the active one.
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                self._write_caught(connection, profile or self._active_profile(connection), entries)
+        finally:
+            connection.close()
+
+    def _active_profile(self, connection: sqlite3.Connection) -> str:
+        row = connection.execute("SELECT value FROM meta WHERE key = 'active_profile'").fetchone()
+        return DEFAULT_PROFILE if row is None else row[0]
+
+    def active_profile(self) -> str:
+        """Returns the name of the profile whose progress is loaded and saved."""
+        connection = self._connect()
+        try:
+            return self._active_profile(connection)
+        finally:
+            connection.close()
+
+    def profiles(self) -> list[str]:
+        """Returns the names of all profiles in alphabetical order."""
+        connection = self._connect()
+        try:
+            return [name for name, in connection.execute("SELECT name FROM profiles ORDER BY name")]
+        finally:
+            connection.close()
+
+    def create_profile(self, name: str, copy_from: str | None = None) -> None:
+        """Creates a new profile without any caught animals.
+
+        Args:
+            name (str): Name of the new profile
+            copy_from (str, optional): Start with the progress of this profile
+            instead. Defaults to None.
+
+        Raises:
+            ValueError: If a profile with this name exists already
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                try:
+                    connection.execute("INSERT INTO profiles (name) VALUES (?)", (name,))
+                except sqlite3.IntegrityError:
+                    raise ValueError(f"The profile {name} exists already") from None
+                if copy_from is not None:
+                    self._write_bits(connection, name, self._read_bits(connection, copy_from))
+        finally:
+            connection.close()
+
+    def switch_profile(self, name: str) -> None:
+        """Makes {name} the active profile.
+
+        Raises:
+            ValueError: If there is no such profile
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                if connection.execute("SELECT 1 FROM profiles WHERE name = ?", (name,)).fetchone() is None:
+                    raise ValueError(f"There is no profile {name}")
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('active_profile', ?)", (name,)
+                )
+        finally:
+            connection.close()
+
+    def _aggregate(self, profiles: list[str] | None, combine) -> dict[str, int]:
+        connection = self._connect()
+        try:
+            names = profiles or [name for name, in connection.execute("SELECT name FROM profiles")]
+            kinds = [kind for kind, in connection.execute("SELECT DISTINCT kind FROM animals")]
+            all_bits = [self._read_bits(connection, name) for name in names]
+        finally:
+            connection.close()
+        aggregate = {}
+        for kind in kinds:
+            values = [bits.get(kind, 0) for bits in all_bits]
+            aggregate[kind] = combine(values) if values else 0
+        return aggregate
+
+    def caught_by_any(self, profiles: list[str] | None = None) -> dict[str, int]:
+        """Bitsets of the ids caught by at least one profile.
+
+        Args:
+            profiles (list[str], optional): Defaults to all profiles.
+
+        Returns:
+            dict[str, int]: Maps every kind to a bitset of ids
+        """
+        return self._aggregate(profiles, lambda values: functools.reduce(operator.or_, values))
+
+    def caught_by_all(self, profiles: list[str] | None = None) -> dict[str, int]:
+        """Bitsets of the ids caught by every profile. See caught_by_any."""
+        return self._aggregate(profiles, lambda values: functools.reduce(operator.and_, values))
+
+    def caught_by_nobody(self, profiles: list[str] | None = None) -> dict[str, list[int]]:
+        """Returns the ids of all animals no profile has caught yet.
+
+        Args:
+            profiles (list[str], optional): Defaults to all profiles.
+
+        Returns:
+            dict[str, list[int]]: Maps every kind to the sorted ids
+        """
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT kind, id FROM animals").fetchall()
+        finally:
+            connection.close()
+        ids = {}
+        for kind, animal_id in rows:
+            ids.setdefault(kind, []).append(animal_id)
+        caught = self.caught_by_any(profiles)
+        return {
+            kind: bitset.to_positions(bitset.from_positions(animal_ids) & ~caught.get(kind, 0))
+            for kind, animal_ids in ids.items()
+        }
+
+    def migrate_pickles(self, directories: dict[str, str]) -> int:
+        """One-time migration from the old layout with one pickle file per
+        animal. Every pickle is read and the whole catalog is committed in a
+        single transaction. The pickle files are left untouched.
+
+        Args:
+            directories (dict[str, str]): Maps every kind to the directory
+            holding its pickle files
+
+        Returns:
+            int: Number of migrated animals
+        """
+        rows = []
+        for kind, directory in directories.items():
+            if not os.path.isdir(directory):
+                continue
+            for file in os.listdir(directory):
+                if not file.endswith(".pkl"):
+                    continue
+                with open(os.path.join(directory, file), "rb") as file_handler:
+                    legacy = _LegacyUnpickler(file_handler).load()
+                state = legacy.__dict__
+                rows.append(
+                    (
+                        kind,
+                        state["id"],
+                        state["save_name"],
+                        encode_api_response(state["api_response"]),
+                        int(state.get("caught", False)),
+                    )
+                )
+        connection = self._connect()
+        try:
+            with connection:
+                self._bump_revision(connection)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO animals (kind, id, save_name, data, caught) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._write_caught(
+                    connection,
+                    self._active_profile(connection),
+                    [(kind, animal_id, bool(caught)) for kind, animal_id, _, _, caught in rows],
+                )
+        finally:
+            connection.close()
+        return len(rows)
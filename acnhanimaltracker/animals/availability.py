@@ -0,0 +1,102 @@
+from datetime import datetime
+from . import bitset
+
+NORTHERN = "northern"
+SOUTHERN = "southern"
+
+
+class AvailabilityIndex:
+    """Answers "what can I catch right now?" with a few bitwise operations
+    instead of scanning the availability of every animal.
+
+    Every animal gets a position in the index. For every hour, every month of
+    both hemispheres and the caught status the index keeps one bitset over
+    these positions, so a query is hour & month & ~caught.
+
+    Args:
+        animals (Iterable[Animal]): All animals to index
+        tracker (ChangeTracker, optional): Keeps the caught bitset up to date
+        when given. Defaults to None.
+    """
+
+    def __init__(self, animals, tracker=None) -> None:
+        self.animals = list(animals)
+        self.positions = {
+            (animal.kind, animal.id): position for position, animal in enumerate(self.animals)
+        }
+        # Most animals share their masks, so every distinct mask is only
+        # expanded once
+        by_mask = {"hour": {}, NORTHERN: {}, SOUTHERN: {}}
+        caught = []
+        for position, animal in enumerate(self.animals):
+            by_mask["hour"].setdefault(animal.hour_mask, []).append(position)
+            by_mask[NORTHERN].setdefault(animal.month_mask, []).append(position)
+            by_mask[SOUTHERN].setdefault(animal.month_mask_southern, []).append(position)
+            if animal.caught:
+                caught.append(position)
+        self.hour_bits = self._expand(by_mask["hour"], 24)
+        self.month_bits = {
+            NORTHERN: self._expand(by_mask[NORTHERN], 12),
+            SOUTHERN: self._expand(by_mask[SOUTHERN], 12),
+        }
+        self.caught_bits = bitset.from_positions(caught)
+        if tracker is not None:
+            tracker.subscribe(self.update_caught)
+
+    @staticmethod
+    def _expand(positions_by_mask: dict[int, list[int]], size: int) -> list[int]:
+        slots = [[] for _ in range(size)]
+        for mask, positions in positions_by_mask.items():
+            for slot in bitset.to_positions(mask):
+                slots[slot].extend(positions)
+        return [bitset.from_positions(positions) for positions in slots]
+
+    def update_caught(self, animal) -> None:
+        """Updates the caught bit of a single animal.
+
+        Args:
+            animal (Animal): The animal whose caught status changed
+        """
+        position = self.positions.get((animal.kind, animal.id))
+        if position is None:
+            return
+        if animal.caught:
+            self.caught_bits |= 1 << position
+        else:
+            self.caught_bits &= ~(1 << position)
+
+    def catchable_bits(
+        self, when: datetime | None = None, hemisphere: str = NORTHERN, uncaught_only: bool = False
+    ) -> int:
+        """Returns the bitset of all animals catchable at {when}.
+
+        Args:
+            when (datetime, optional): Point in time. Defaults to now.
+            hemisphere (str, optional): NORTHERN or SOUTHERN.
+            Defaults to NORTHERN.
+            uncaught_only (bool, optional): Leave out caught animals.
+            Defaults to False.
+
+        Returns:
+            int: Bitset over the positions of self.animals
+        """
+        if hemisphere not in self.month_bits:
+            raise ValueError(f"{hemisphere} is not a valid hemisphere")
+        when = when or datetime.now()
+        bits = self.hour_bits[when.hour] & self.month_bits[hemisphere][when.month - 1]
+        if uncaught_only:
+            bits &= ~self.caught_bits
+        return bits
+
+    def catchable(
+        self, when: datetime | None = None, hemisphere: str = NORTHERN, uncaught_only: bool = False
+    ) -> list:
+        """Returns all animals catchable at {when}. See catchable_bits.
+
+        Returns:
+            list[Animal]: The catchable animals
+        """
+        return [
+            self.animals[position]
+            for position in bitset.to_positions(self.catchable_bits(when, hemisphere, uncaught_only))
+        ]
@@ -0,0 +1,43 @@
+"""Helpers for sets of small non-negative integers stored as Python ints.
+
+Bit n of the integer is set if n is part of the set. Union, intersection and
+difference are then a single |, & or & ~ over the whole set.
+"""
+
+_BYTE_POSITIONS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def from_positions(positions) -> int:
+    """Builds a bitset from an iterable of positions in linear time.
+
+    Args:
+        positions (Iterable[int]): The positions to set
+
+    Returns:
+        int: The bitset
+    """
+    positions = list(positions)
+    if not positions:
+        return 0
+    buffer = bytearray(max(positions) // 8 + 1)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def to_positions(bitset: int) -> list[int]:
+    """Returns all set positions of a bitset in ascending order.
+
+    Args:
+        bitset (int): The bitset
+
+    Returns:
+        list[int]: The set positions
+    """
+    positions = []
+    data = bitset.to_bytes((bitset.bit_length() + 7) // 8, "little")
+    for index, byte in enumerate(data):
+        if byte:
+            offset = index << 3
+            positions.extend(offset + bit for bit in _BYTE_POSITIONS[byte])
+    return positions
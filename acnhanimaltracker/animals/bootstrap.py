@@ -0,0 +1,132 @@
+import queue
+import threading
+from .animal import Fish, Bug, SeaCreature
+from .downloader import DownloadError
+from .image_ingest import make_thumbnails, resize_pool
+
+_DONE = None
+
+
+def stream_bootstrap(
+    animal_handler,
+    download_workers: int = 16,
+    resize_workers: int | None = None,
+    queue_size: int = 64,
+) -> list[list[Fish | Bug | SeaCreature]]:
+    """First-run setup as one streaming pipeline instead of strict phases:
+
+    fetch endpoint -> parse -> persist (AnimalStore)
+                           \\-> download image -> resize (process pool) -> atlas
+
+    Every endpoint is fetched in its own thread. Parsed animals flow through
+    bounded queues into persistence and image downloads while the other
+    endpoints are still downloading, so the total time approaches the one of
+    the slowest stage. Each kind is persisted in one transaction as soon as
+    its endpoint is parsed. The animals are returned directly, without
+    reading them back via load_animals. Images which could not be downloaded
+    or decoded are only reported, AnimalHandler.repair fetches them later.
+
+    Args:
+        animal_handler (AnimalHandler): Handler of the installation
+        download_workers (int, optional): Concurrent image downloads.
+        Defaults to 16.
+        resize_workers (int | None, optional): Processes resizing images.
+        Defaults to None (one per CPU).
+        queue_size (int, optional): Capacity of the queues between the stages.
+        Defaults to 64.
+
+    Returns:
+        list[list[Fish | Bug | SeaCreature]]: Same format as load_animals
+    """
+    sources = [
+        (Fish, animal_handler.fish_api_endpoint),
+        (Bug, animal_handler.bug_api_endpoint),
+        (SeaCreature, animal_handler.sea_api_endpoint),
+    ]
+    persist_queue = queue.Queue(queue_size)
+    image_queue = queue.Queue(queue_size)
+    animal_list = [[] for _ in sources]
+    errors = []
+    failed_kinds = set()
+
+    def fetch(index, animal_class, endpoint):
+        try:
+            response = animal_handler.send_request(endpoint)
+            for api_response in response.values():
+                animal = animal_class(api_response, animal_handler.root_directory)
+                animal.tracker = animal_handler.tracker
+                animal_list[index].append(animal)
+                persist_queue.put((animal_class.kind, api_response, animal.save_name))
+                image_queue.put(animal)
+        except Exception as error:
+            errors.append(error)
+            failed_kinds.add(animal_class.kind)
+        finally:
+            persist_queue.put((animal_class.kind, _DONE, _DONE))
+
+    def persist():
+        pending = {animal_class.kind: ([], []) for animal_class, _ in sources}
+        finished = 0
+        while finished < len(sources):
+            kind, api_response, save_name = persist_queue.get()
+            if api_response is _DONE:
+                finished += 1
+                if kind in failed_kinds:
+                    continue
+                try:
+                    animal_handler.store.replace_kind(kind, *pending.pop(kind))
+                except Exception as error:
+                    errors.append(error)
+            else:
+                pending[kind][0].append(api_response)
+                pending[kind][1].append(save_name)
+
+    def download(resizes):
+        while True:
+            animal = image_queue.get()
+            if animal is _DONE:
+                return
+            try:
+                data = animal_handler._fetch_image(animal)
+                resizes.submit(make_thumbnails, data).add_done_callback(
+                    lambda future, animal=animal: written(animal, future)
+                )
+            except DownloadError as error:
+                print(f"Could not download the image of {animal.name}: {error}")
+            except Exception as error:
+                # Keep draining the queue, a dead downloader would block fetch forever
+                errors.append(error)
+
+    def written(animal, future):
+        try:
+            thumbnails = future.result()
+        except Exception as error:
+            # e.g. PIL.UnidentifiedImageError, the thumbnail is left for repair
+            print(f"Could not resize the image of {animal.name}: {error}")
+            return
+        try:
+            animal_handler._write_thumbnails(animal, thumbnails)
+        except Exception as error:
+            errors.append(error)
+
+    with animal_handler.open_atlas_writer(), resize_pool(resize_workers) as resizes:
+        fetchers = [
+            threading.Thread(target=fetch, args=(index, animal_class, endpoint))
+            for index, (animal_class, endpoint) in enumerate(sources)
+        ]
+        persister = threading.Thread(target=persist)
+        downloaders = [threading.Thread(target=download, args=(resizes,)) for _ in range(download_workers)]
+        for thread in fetchers + [persister] + downloaders:
+            thread.start()
+        for thread in fetchers:
+            thread.join()
+        for _ in downloaders:
+            image_queue.put(_DONE)
+        for thread in [persister] + downloaders:
+            thread.join()
+    if errors:
+        raise errors[0]
+
+    for animal_type in animal_list:
+        animal_type.sort(key=lambda animal: animal.id)
+    return animal_list
@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+import zipfile
+from .thumbnail_atlas import ThumbnailAtlas, migrate_image_directories
+
+BUNDLE_VERSION = 1
+
+
+def build_bundle(animal_handler, path: str) -> None:
+    """Packs the catalog and all thumbnails of an installation into a single
+    zip archive which can bootstrap other installations without network
+    access (see bootstrap_from_bundle). Your progress is not included.
+
+    Archive layout:
+    * bundle.json: format version
+    * catalog/<kind>.json: list of the json-responses of every animal
+    * thumbnails.atlas: the ThumbnailAtlas, stored uncompressed
+
+    Args:
+        animal_handler (AnimalHandler): Handler of the installation
+        path (str): Path of the archive to create
+    """
+    root_directory = animal_handler.root_directory
+    if not ThumbnailAtlas.exists(root_directory):
+        migrate_image_directories(root_directory)
+    catalog = {kind: [] for kind in animal_handler.animal_classes}
+    for kind, api_response, _ in animal_handler.store.load():
+        catalog[kind].append(api_response)
+
+    with zipfile.ZipFile(f"{path}.tmp", "w") as archive:
+        archive.writestr("bundle.json", json.dumps({"version": BUNDLE_VERSION}))
+        for kind, api_responses in catalog.items():
+            archive.writestr(
+                f"catalog/{kind}.json", json.dumps(api_responses), compress_type=zipfile.ZIP_DEFLATED
+            )
+        # PNG data is compressed already
+        archive.write(
+            os.path.join(root_directory, ThumbnailAtlas.file_name),
+            "thumbnails.atlas",
+            compress_type=zipfile.ZIP_STORED,
+        )
+    os.replace(f"{path}.tmp", path)
+
+
+def bootstrap_from_bundle(animal_handler, path: str) -> None:
+    """Sets up an installation from an archive created by build_bundle in a
+    single pass over the archive. The catalog replaces the local one (the
+    progress is reset like with AnimalHandler.reset_animals) and the atlas is
+    unpacked as is and recorded in the Manifest, so the next start does not
+    hash every thumbnail again.
+
+    Args:
+        animal_handler (AnimalHandler): Handler of the installation
+        path (str): Path of the archive
+
+    Raises:
+        ValueError: If the archive has an unknown format version
+    """
+    root_directory = animal_handler.root_directory
+    with zipfile.ZipFile(path) as archive:
+        version = json.loads(archive.read("bundle.json"))["version"]
+        if version != BUNDLE_VERSION:
+            raise ValueError(f"{path} has the unsupported bundle version {version}")
+        for kind, animal_class in animal_handler.animal_classes.items():
+            api_responses = json.loads(archive.read(f"catalog/{kind}.json"))
+            save_names = [
+                animal_class(api_response, root_directory).save_name for api_response in api_responses
+            ]
+            animal_handler.store.replace_kind(kind, api_responses, save_names)
+
+        atlas_path = os.path.join(root_directory, ThumbnailAtlas.file_name)
+        with archive.open("thumbnails.atlas") as source, open(f"{atlas_path}.tmp", "wb") as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.replace(f"{atlas_path}.tmp", atlas_path)
+    animal_handler.write_manifest()
@@ -0,0 +1,172 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from . import bitset
+from .availability import AvailabilityIndex, NORTHERN
+from .name_index import NameIndex
+
+
+class AnimalCatalog:
+    """Indexed view of all animals returned by AnimalHandler.load_animals.
+
+    Keeps hash indexes by (kind, id), save_name and name, inverted indexes
+    (value -> bitset over the catalog positions) by kind, location, shadow and
+    rarity, a sorted price index and an n-gram index of the names (built on
+    the first name query). Queries intersect these indexes instead of
+    scanning every animal. The caught status is shared with the
+    AvailabilityIndex of the catalog.
+
+    Args:
+        animal_list (list[list[Fish | Bug | SeaCreature]]): The list created by
+        AnimalHandler.load_animals()
+        tracker (ChangeTracker, optional): Keeps the caught bitset up to date
+        when given. Defaults to None.
+    """
+
+    indexed_attributes = ("kind", "location", "shadow", "rarity")
+
+    def __init__(self, animal_list, tracker=None) -> None:
+        self.animal_list = animal_list
+        self.animals = [animal for animal_type in animal_list for animal in animal_type]
+        self.availability = AvailabilityIndex(self.animals, tracker)
+        self.positions = self.availability.positions
+
+        self.by_key = {(animal.kind, animal.id): animal for animal in self.animals}
+        self.by_save_name = {animal.save_name: animal for animal in self.animals}
+        self.by_name = {}
+        positions_by_value = {attribute: {} for attribute in self.indexed_attributes}
+        for position, animal in enumerate(self.animals):
+            self.by_name.setdefault(animal.name.lower(), []).append(animal)
+            for attribute, index in positions_by_value.items():
+                value = getattr(animal, attribute, None)
+                if value is not None:
+                    index.setdefault(value, []).append(position)
+        self.inverted = {
+            attribute: {value: bitset.from_positions(positions) for value, positions in index.items()}
+            for attribute, index in positions_by_value.items()
+        }
+
+        price_order = sorted(range(len(self.animals)), key=lambda position: self.animals[position].price)
+        self.price_positions = price_order
+        self.prices = [self.animals[position].price for position in price_order]
+        self.all_bits = (1 << len(self.animals)) - 1
+        self._name_index = None
+
+    def __len__(self) -> int:
+        return len(self.animals)
+
+    def __iter__(self):
+        return iter(self.animals)
+
+    def get(self, kind: str, animal_id: int):
+        """Returns the animal of a kind (e.g.: "fish") by its id.
+
+        Raises:
+            KeyError: If there is no such animal
+        """
+        return self.by_key[(kind, animal_id)]
+
+    def get_by_save_name(self, save_name: str):
+        """Returns the animal with the given save_name.
+
+        Raises:
+            KeyError: If there is no such animal
+        """
+        return self.by_save_name[save_name]
+
+    def find_by_name(self, name: str) -> list:
+        """Returns all animals with the given name (case insensitive)."""
+        return list(self.by_name.get(name.lower(), []))
+
+    @property
+    def name_index(self) -> NameIndex:
+        """Index of the names by substring, built on first use."""
+        if self._name_index is None:
+            self._name_index = NameIndex([animal.name for animal in self.animals])
+        return self._name_index
+
+    def values(self, attribute: str) -> list[str]:
+        """Returns all distinct values of an indexed attribute."""
+        return sorted(self.inverted[attribute])
+
+    def _attribute_bits(self, attribute: str, value) -> int:
+        index = self.inverted[attribute]
+        if isinstance(value, str):
+            return index.get(value, 0)
+        bits = 0
+        for single_value in value:
+            bits |= index.get(single_value, 0)
+        return bits
+
+    def _price_bits(self, bits: int, min_price: int | None, max_price: int | None) -> int:
+        start = 0 if min_price is None else bisect_left(self.prices, min_price)
+        end = len(self.prices) if max_price is None else bisect_right(self.prices, max_price)
+        if start >= end:
+            return 0
+        # Filter the smaller one of both candidate sets
+        if bits.bit_count() < end - start:
+            return bitset.from_positions(
+                position
+                for position in bitset.to_positions(bits)
+                if (min_price is None or self.animals[position].price >= min_price)
+                and (max_price is None or self.animals[position].price <= max_price)
+            )
+        return bits & bitset.from_positions(self.price_positions[start:end])
+
+    def query_bits(
+        self,
+        kind=None,
+        name: str | None = None,
+        caught: bool | None = None,
+        location=None,
+        shadow=None,
+        rarity=None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        available_at: datetime | None = None,
+        hemisphere: str = NORTHERN,
+    ) -> int:
+        """Returns the bitset over self.animals matching all given filters.
+        See query for the arguments.
+        """
+        bits = self.all_bits
+        for attribute, value in (("kind", kind), ("location", location), ("shadow", shadow), ("rarity", rarity)):
+            if value is not None:
+                bits &= self._attribute_bits(attribute, value)
+        if name:
+            bits &= self.name_index.search_bits(name)
+        if caught is True:
+            bits &= self.availability.caught_bits
+        elif caught is False:
+            bits &= ~self.availability.caught_bits
+        if available_at is not None:
+            bits &= self.availability.catchable_bits(available_at, hemisphere)
+        if bits and (min_price is not None or max_price is not None):
+            bits = self._price_bits(bits, min_price, max_price)
+        return bits
+
+    def query(self, **filters) -> list:
+        """Returns all animals matching every given filter, ordered like
+        self.animals.
+
+        Args:
+            kind (str | Iterable[str], optional): e.g. "fish"
+            name (str, optional): Part of the name (case insensitive)
+            caught (bool, optional): Only caught or only uncaught animals
+            location (str | Iterable[str], optional): e.g. "River"
+            shadow (str | Iterable[str], optional): e.g. "Large (5)"
+            rarity (str | Iterable[str], optional): e.g. "Rare"
+            min_price (int, optional): Inclusive lower price bound
+            max_price (int, optional): Inclusive upper price bound
+            available_at (datetime, optional): Only animals catchable then
+            hemisphere (str, optional): Hemisphere of available_at.
+            Defaults to NORTHERN.
+
+        Returns:
+            list[Animal]: The matching animals
+        """
+        return [self.animals[position] for position in bitset.to_positions(self.query_bits(**filters))]
+
+    def sorted_by_price(self, descending: bool = False) -> list:
+        """Returns all animals ordered by their price."""
+        order = reversed(self.price_positions) if descending else self.price_positions
+        return [self.animals[position] for position in order]
@@ -0,0 +1,62 @@
+import threading
+
+
+class ChangeTracker:
+    """Collects every animal whose caught status changed since the last save,
+    so only those entries have to be persisted. Animals report themselves via
+    Animal.switch_caught_status and Animal.set_caught_status once the
+    AnimalHandler attached a tracker to them.
+
+    Other components can subscribe to be notified about every single change.
+    If a ProgressJournal is attached, every change is also appended to it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._changed = {}
+        self._listeners = []
+        self.journal = None
+
+    def __len__(self) -> int:
+        return len(self._changed)
+
+    def mark(self, animal) -> None:
+        """Records a changed animal and notifies all subscribers.
+
+        Args:
+            animal (Animal): The animal whose caught status changed
+        """
+        with self._lock:
+            self._changed[(animal.kind, animal.id)] = animal
+        if self.journal is not None:
+            self.journal.append(animal.kind, animal.id, animal.caught)
+        self.notify(animal)
+
+    def notify(self, animal) -> None:
+        """Notifies all subscribers about a changed animal without recording
+        it for the next save, e.g. after loading the progress of another
+        profile.
+
+        Args:
+            animal (Animal): The animal whose caught status changed
+        """
+        for listener in self._listeners:
+            listener(animal)
+
+    def drain(self) -> list:
+        """Returns all changed animals and starts a new, empty change set.
+
+        Returns:
+            list[Animal]: The animals changed since the last drain
+        """
+        with self._lock:
+            changed, self._changed = self._changed, {}
+        return list(changed.values())
+
+    def subscribe(self, listener) -> None:
+        """Registers a callable that is called with every changed animal.
+
+        Args:
+            listener (Callable[[Animal], None]): The callback
+        """
+        self._listeners.append(listener)
@@ -0,0 +1,215 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from .animal import Fish, Bug, SeaCreature
+
+COLUMNAR_VERSION = 1
+
+_MAGIC = b"ACNHCOL\0"
+# magic, version, byte order, column count, row count, catalog revision
+_HEADER = struct.Struct("<8sHcxIIQ")
+# name, typecode, offset, length
+_COLUMN = struct.Struct("<32sc7xQQ")
+_NONE = 0xFFFFFFFF
+
+KINDS = (Fish, Bug, SeaCreature)
+NUMERIC_COLUMNS = (
+    ("kind", "B"),
+    ("id", "I"),
+    ("price", "I"),
+    ("surcharge", "I"),
+    ("hour_mask", "I"),
+    ("month_mask", "H"),
+    ("month_mask_southern", "H"),
+)
+STRING_COLUMNS = ("name", "save_name", "location", "shadow", "rarity", "speed", "image_url")
+
+
+def write_columnar_catalog(path: str, animals, revision: int) -> None:
+    """Writes the static catalog (everything but the caught status) of the
+    given animals as ColumnarCatalog file.
+
+    Args:
+        path (str): Path of the file
+        animals (Iterable[Animal]): The animals in the order they should be
+        read back
+        revision (int): AnimalStore.catalog_revision the animals were loaded at
+    """
+    strings = {}
+    columns = {name: array(typecode) for name, typecode in NUMERIC_COLUMNS}
+    columns.update({name: array("I") for name in STRING_COLUMNS})
+    kind_index = {animal_class.kind: index for index, animal_class in enumerate(KINDS)}
+    for animal in animals:
+        columns["kind"].append(kind_index[animal.kind])
+        for name, _ in NUMERIC_COLUMNS[1:]:
+            columns[name].append(getattr(animal, name, 0))
+        for name in STRING_COLUMNS:
+            value = getattr(animal, name, None)
+            columns[name].append(_NONE if value is None else strings.setdefault(value, len(strings)))
+
+    # String table: utf-8 data of all distinct strings plus their offsets
+    encoded = [value.encode() for value in strings]
+    offsets = array("I", [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    columns["string_offsets"] = offsets
+    columns["string_data"] = array("B", b"".join(encoded))
+
+    position = _HEADER.size + _COLUMN.size * len(columns)
+    directory = []
+    for name, values in columns.items():
+        position += -position % 8
+        directory.append((name, values, position))
+        position += len(values) * values.itemsize
+
+    byte_order = b"<" if sys.byteorder == "little" else b">"
+    with open(f"{path}.tmp", "wb") as file_handler:
+        file_handler.write(
+            _HEADER.pack(_MAGIC, COLUMNAR_VERSION, byte_order, len(columns), len(columns["id"]), revision)
+        )
+        for name, values, offset in directory:
+            file_handler.write(_COLUMN.pack(name.encode(), values.typecode.encode(), offset, len(values)))
+        for _, values, offset in directory:
+            file_handler.write(b"\0" * (offset - file_handler.tell()))
+            values.tofile(file_handler)
+    os.replace(f"{path}.tmp", path)
+
+
+class ColumnarCatalog:
+    """Memory-mapped, schema-versioned file holding the static catalog in
+    columns: fixed-width numeric columns (kind, id, price, surcharge, masks)
+    and string columns pointing into a shared string table.
+
+    column() returns a zero-copy view of a single column, e.g. all prices for
+    sorting, without creating any Animal. animal() creates single animals on
+    demand with the same API as the ones built from the api_response.
+
+    The file stays mapped until close() (or the end of a with block), which
+    is needed before the file can be replaced on Windows.
+
+    Args:
+        path (str): Path of the file
+        root_directory (str): The root directory created in main.py
+
+    Raises:
+        ValueError: If the file has another format version or byte order
+    """
+
+    file_name = "acnhanimaltracker/animals/catalog.columns"
+
+    def __init__(self, path: str, root_directory: str) -> None:
+        self.path = path
+        self.root_directory = root_directory
+        with open(path, "rb") as file_handler:
+            self._mmap = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, byte_order, column_count, self.rows, self.revision = _HEADER.unpack_from(
+            self._mmap, 0
+        )
+        if magic != _MAGIC or version != COLUMNAR_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is no columnar catalog of version {COLUMNAR_VERSION}")
+        if byte_order != (b"<" if sys.byteorder == "little" else b">"):
+            self._mmap.close()
+            raise ValueError(f"{path} was written with another byte order")
+        self._columns = {}
+        for index in range(column_count):
+            name, typecode, offset, length = _COLUMN.unpack_from(
+                self._mmap, _HEADER.size + index * _COLUMN.size
+            )
+            self._columns[name.rstrip(b"\0").decode()] = (typecode.decode(), offset, length)
+        self._strings = {}
+        self._string_offsets = self.column("string_offsets")
+        self._string_data = self.column("string_data")
+
+    @classmethod
+    def open(cls, root_directory: str):
+        """Opens the columnar catalog of an installation.
+
+        Returns:
+            ColumnarCatalog | None: The catalog or None if there is no usable one
+        """
+        path = os.path.join(root_directory, cls.file_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path, root_directory)
+        except (ValueError, struct.error):
+            return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def close(self) -> None:
+        """Unmaps the file. Views returned by column() must be released
+        first."""
+        self._string_offsets.release()
+        self._string_data.release()
+        self._mmap.close()
+
+    def column(self, name: str) -> memoryview:
+        """Returns a read-only, zero-copy view of a column.
+
+        Args:
+            name (str): One of NUMERIC_COLUMNS or STRING_COLUMNS (string
+            table indexes)
+        """
+        typecode, offset, length = self._columns[name]
+        size = struct.calcsize(typecode)
+        return memoryview(self._mmap)[offset : offset + length * size].cast(typecode)
+
+    def string(self, index: int) -> str | None:
+        """Decodes an entry of the string table."""
+        if index == _NONE:
+            return None
+        value = self._strings.get(index)
+        if value is None:
+            start, end = self._string_offsets[index], self._string_offsets[index + 1]
+            value = self._strings[index] = sys.intern(bytes(self._string_data[start:end]).decode())
+        return value
+
+    def animal(self, row: int):
+        """Creates the animal stored in a row.
+
+        Args:
+            row (int): Row index
+
+        Returns:
+            Fish | Bug | SeaCreature: The animal, not caught
+        """
+        animal_class = KINDS[self.column("kind")[row]]
+        fields = {}
+        for slot in animal_class._state_slots():
+            if slot in ("root_directory", "caught"):
+                continue
+            if slot in STRING_COLUMNS:
+                fields[slot] = self.string(self.column(slot)[row])
+            else:
+                fields[slot] = self.column(slot)[row]
+        return animal_class.from_fields(self.root_directory, **fields)
+
+    def animals(self) -> list[list[Fish | Bug | SeaCreature]]:
+        """Creates all animals, grouped like AnimalHandler.load_animals."""
+        columns = {
+            slot: self.column(slot).tolist()
+            for slot, _ in NUMERIC_COLUMNS + tuple((name, "I") for name in STRING_COLUMNS)
+        }
+        animal_list = [[] for _ in KINDS]
+        for row in range(self.rows):
+            kind = columns["kind"][row]
+            animal_class = KINDS[kind]
+            fields = {}
+            for slot in animal_class._state_slots():
+                if slot in ("root_directory", "caught"):
+                    continue
+                value = columns[slot][row]
+                fields[slot] = self.string(value) if slot in STRING_COLUMNS else value
+            animal_list[kind].append(animal_class.from_fields(self.root_directory, **fields))
+        return animal_list
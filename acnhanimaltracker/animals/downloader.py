@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class DownloadError(Exception):
+    """Raised if a download failed for good or returned unusable content."""
+
+
+class DownloadResult:
+    """Answer of Downloader.get with its validated content.
+
+    Args:
+        status_code (int): HTTP status, 200 or 304
+        headers (Mapping[str, str]): The case-insensitive response headers
+        content (bytes): The body, empty for 304
+    """
+
+    def __init__(self, status_code: int, headers, content: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class Downloader:
+    """Shared HTTP client for every request to the API and the image hosts.
+
+    All requests go through one requests.Session with a bounded connection
+    pool. A semaphore limits the number of concurrent requests across all
+    threads, every request has a timeout, and failed requests (connection
+    errors, timeouts, broken streams, 429 and 5xx answers) are retried with
+    exponential backoff. Responses are checked for status, content-type and
+    size before their content is returned as DownloadResult.
+
+    Args:
+        max_concurrency (int, optional): Requests running at the same time.
+        Defaults to 16.
+        timeout (tuple[float, float], optional): Connect and read timeout in
+        seconds. Defaults to (5, 30).
+        retries (int, optional): Retries after the first attempt.
+        Defaults to 4.
+        backoff (float, optional): Seconds to wait before the first retry,
+        doubled for every further retry. Defaults to 0.5.
+        max_size (int, optional): Maximum size of a response in bytes.
+        Defaults to 10 MiB.
+    """
+
+    retry_status_codes = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        timeout: tuple[float, float] = (5, 30),
+        retries: int = 4,
+        backoff: float = 0.5,
+        max_size: int = 10 * 1024 * 1024,
+    ) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_size = max_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def get(self, url: str, content_type: str | None = None, headers: dict | None = None) -> DownloadResult:
+        """Sends a GET request, retrying transient failures.
+
+        Args:
+            url (str): The url to request
+            content_type (str, optional): Required prefix of the content-type
+            (e.g.: "image/"). Defaults to None.
+            headers (dict, optional): Additional request headers.
+            Defaults to None.
+
+        Raises:
+            DownloadError: If all attempts failed or the content is unusable
+
+        Returns:
+            DownloadResult: Status, headers and the validated content
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                with self._slots:
+                    response = self.session.get(url, timeout=self.timeout, headers=headers, stream=True)
+                    try:
+                        if response.status_code in self.retry_status_codes:
+                            continue
+                        self._validate(url, response, content_type)
+                        content = self._read(url, response) if response.status_code == 200 else b""
+                    finally:
+                        response.close()
+                return DownloadResult(response.status_code, response.headers, content)
+            except requests.RequestException:
+                # Also broken streams (ChunkedEncodingError, ContentDecodingError)
+                # and redirect loops, not only connection errors and timeouts
+                continue
+        raise DownloadError(f"Giving up on {url} after {self.retries + 1} attempts")
+
+    def _validate(self, url: str, response: requests.Response, content_type: str | None) -> None:
+        if response.status_code == 304:
+            return
+        if response.status_code != 200:
+            raise DownloadError(f"{url} answered with status {response.status_code}")
+        received_type = response.headers.get("Content-Type", "")
+        if content_type is not None and not received_type.startswith(content_type):
+            raise DownloadError(f"{url} sent {received_type!r} instead of {content_type!r}")
+        if int(response.headers.get("Content-Length", 0)) > self.max_size:
+            raise DownloadError(f"{url} is larger than {self.max_size} bytes")
+
+    def _read(self, url: str, response: requests.Response) -> bytes:
+        content = bytearray()
+        for chunk in response.iter_content(64 * 1024):
+            content += chunk
+            if len(content) > self.max_size:
+                raise DownloadError(f"{url} is larger than {self.max_size} bytes")
+        return bytes(content)
+
+    def get_json(self, url: str) -> dict:
+        """Downloads and decodes a json document. See get."""
+        return self.get(url, content_type="application/json").json()
+
+    def get_image(self, url: str) -> bytes:
+        """Downloads an image. See get."""
+        return self.get(url, content_type="image/").content
+
+    def close(self) -> None:
+        self.session.close()
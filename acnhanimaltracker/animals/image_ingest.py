@@ -0,0 +1,86 @@
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+THUMBNAIL_WIDTH = 250
+# Every image is stored in these widths, so small views never decode and
+# shrink the large thumbnail
+THUMBNAIL_WIDTHS = (48, 96, THUMBNAIL_WIDTH)
+
+
+def resize_pool(workers: int | None = None) -> ProcessPoolExecutor:
+    """Process pool for make_thumbnails. The workers are spawned instead of
+    forked: the pool is fed by download threads, and a child forked while
+    another thread holds a lock (e.g. of the logging or ssl module) can hang
+    forever.
+
+    Args:
+        workers (int | None, optional): Number of processes.
+        Defaults to None (one per CPU).
+    """
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def resize_to_width(image: Image.Image, width: int = THUMBNAIL_WIDTH) -> Image.Image:
+    """Resizes an image to a specified width respecting the aspect ratio.
+    Large images are first shrunk by an integer factor (reducing_gap),
+    which is much cheaper than a full LANCZOS pass over the original.
+
+    Args:
+        image (Image.Image): Original sized image
+        width (int, optional): Target width. Defaults to THUMBNAIL_WIDTH.
+
+    Returns:
+        Image.Image: The resized image
+    """
+    height = max(1, int(image.size[1] * width / image.size[0]))
+    return image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+
+def make_thumbnail(data: bytes, width: int = THUMBNAIL_WIDTH) -> tuple[bytes, int, int]:
+    """Decodes a downloaded image straight from memory, downscales it and
+    encodes it as PNG. Module level function so it can run in a process pool.
+
+    Args:
+        data (bytes): The raw image data of the HTTP response
+        width (int, optional): Target width. Defaults to THUMBNAIL_WIDTH.
+
+    Returns:
+        tuple[bytes, int, int]: PNG data, width and height of the thumbnail
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        # Lets the JPEG decoder skip detail we throw away anyway (no-op for PNG)
+        image.draft(None, (width, max(1, int(image.size[1] * width / image.size[0]))))
+        thumbnail = resize_to_width(image, width)
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format="PNG")
+    return buffer.getvalue(), thumbnail.size[0], thumbnail.size[1]
+
+
+def make_thumbnails(
+    data: bytes, widths: tuple[int, ...] = THUMBNAIL_WIDTHS
+) -> dict[int, tuple[bytes, int, int]]:
+    """Like make_thumbnail for several widths at once. The image is decoded
+    once, every smaller thumbnail is derived from the next larger one.
+
+    Args:
+        data (bytes): The raw image data of the HTTP response
+        widths (tuple[int, ...], optional): Target widths.
+        Defaults to THUMBNAIL_WIDTHS.
+
+    Returns:
+        dict[int, tuple[bytes, int, int]]: Maps every width to the PNG data,
+        width and height of its thumbnail
+    """
+    largest = max(widths)
+    thumbnails = {}
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft(None, (largest, max(1, int(image.size[1] * largest / image.size[0]))))
+        thumbnail = image
+        for width in sorted(widths, reverse=True):
+            thumbnail = resize_to_width(thumbnail, width)
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, format="PNG")
+            thumbnails[width] = (buffer.getvalue(), thumbnail.size[0], thumbnail.size[1])
+    return thumbnails
@@ -0,0 +1,258 @@
+import contextlib
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_MAGIC = b"ACNHJRN2"
+_PROFILE_LENGTH = struct.Struct("<H")
+_MARKER = 0xA5
+_RECORD = struct.Struct("<BBIB")
+
+
+def _try_lock(file_handler) -> bool:
+    """Takes an exclusive lock on an open file without waiting.
+
+    Returns:
+        bool: False if another process holds the lock
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(file_handler.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            file_handler.seek(0)
+            msvcrt.locking(file_handler.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _header(profile: str) -> bytes:
+    encoded = profile.encode()
+    return _MAGIC + _PROFILE_LENGTH.pack(len(encoded)) + encoded
+
+
+class ProgressJournal:
+    """Append-only write-ahead journal of caught status changes, so progress
+    survives a crash between two saves of the AnimalStore.
+
+    Every process writes its own journal file, which starts with the name of
+    the profile its records belong to and is locked exclusively while the
+    process runs. Every change appends a 7 byte record (marker, kind, id,
+    caught) to a buffered file, which only costs a few microseconds. A
+    background thread flushes and fsyncs the buffer every {interval}
+    seconds. Records hold the new status instead of a toggle, so replaying a
+    record twice is harmless.
+
+    Compaction only remembers the end of the journal while holding its
+    lock and saves the changes into the store without it, so appending
+    never waits for the store. Afterwards only the records up to that end
+    are dropped by writing the kept records into a new file, which replaces
+    the journal atomically. Journals left
+    by processes that died are unlocked and replayed by the next process,
+    see recover.
+
+    Args:
+        root_directory (str): The root directory created in main.py
+        kinds (list[str]): All kinds, a record stores the index of its kind
+        profile (str): Profile the records belong to
+        interval (float, optional): Seconds between two fsyncs.
+        Defaults to 0.1.
+    """
+
+    directory_name = "acnhanimaltracker/animals/journal"
+
+    def __init__(self, root_directory: str, kinds: list[str], profile: str, interval: float = 0.1) -> None:
+        self.directory = os.path.join(root_directory, self.directory_name)
+        self.path = os.path.join(self.directory, f"{os.getpid()}-{time.time_ns()}.journal")
+        self.kinds = list(kinds)
+        self.profile = profile
+        self._kind_indexes = {kind: index for index, kind in enumerate(self.kinds)}
+        self._lock = threading.Lock()
+        self._file = None
+        self._dirty = False
+        self._interval = interval
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def _read(self, data: bytes) -> tuple[str | None, dict[tuple[str, int], bool]]:
+        if not data.startswith(_MAGIC):
+            return None, {}
+        (length,) = _PROFILE_LENGTH.unpack_from(data, len(_MAGIC))
+        start = len(_MAGIC) + _PROFILE_LENGTH.size
+        profile = data[start : start + length].decode()
+        states = {}
+        # A torn record at the end (e.g. after a power loss) ends the replay
+        for offset in range(start + length, len(data) - _RECORD.size + 1, _RECORD.size):
+            marker, kind_index, animal_id, caught = _RECORD.unpack_from(data, offset)
+            if marker != _MARKER or kind_index >= len(self.kinds):
+                break
+            states[(self.kinds[kind_index], animal_id)] = bool(caught)
+        return profile, states
+
+    def recover(self, restore) -> int:
+        """Replays the journals of processes that ended without compacting
+        them and deletes them. Journals of running processes are locked and
+        skipped. This journal is flushed before a replayed one is deleted, so
+        restored changes recorded in it are never lost.
+
+        Args:
+            restore (Callable[[str, dict[tuple[str, int], bool]], None]):
+            Called with the profile and the latest caught status per
+            (kind, id) of every journal
+
+        Returns:
+            int: Number of replayed changes
+        """
+        replayed = 0
+        for file_name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, file_name)
+            if file_name.endswith(".journal.tmp") and fcntl is not None:
+                # Left by a process that died while compacting, the journal
+                # it should have replaced is still complete
+                # (renamed meanwhile if the process is still compacting)
+                with contextlib.suppress(FileNotFoundError), open(path, "rb") as file_handler:
+                    if _try_lock(file_handler):
+                        os.remove(path)
+                continue
+            if path == self.path or not file_name.endswith(".journal"):
+                continue
+            with open(path, "rb") as file_handler:
+                if not _try_lock(file_handler):
+                    continue
+                profile, states = self._read(file_handler.read())
+                if profile is not None and states:
+                    restore(profile, states)
+                    replayed += len(states)
+                self.flush()
+                if fcntl is not None:
+                    # Deleted while locked, so no other process replays it again
+                    os.remove(path)
+            if fcntl is None:
+                os.remove(path)
+        return replayed
+
+    def open(self) -> None:
+        """Creates and locks the journal of this process and starts the
+        background fsync."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = open(self.path, "ab")
+        if not _try_lock(self._file):
+            raise OSError(f"{self.path} is locked by another process")
+        self._file.write(_header(self.profile))
+        self._dirty = True
+        self.flush()
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    def append(self, kind: str, animal_id: int, caught: bool) -> None:
+        """Records the new caught status of an animal. The record is durable
+        after the next fsync, at most {interval} seconds later.
+
+        Args:
+            kind (str): The kind of the animal (e.g.: "fish")
+            animal_id (int): The id of the animal
+            caught (bool): The new caught status
+        """
+        record = _RECORD.pack(_MARKER, self._kind_indexes[kind], animal_id, caught)
+        with self._lock:
+            self._file.write(record)
+            self._dirty = True
+
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes and fsyncs all buffered records."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._dirty and self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+
+    def compact(self, save, profile: str | None = None):
+        """Moves all records appended so far into the store. save runs
+        without holding the lock, records appended meanwhile are kept.
+
+        Args:
+            save (Callable[[], int]): Saves every pending change into the
+            store, e.g. AnimalHandler.save_changes. The records are only
+            dropped if it returns without an exception.
+            profile (str, optional): Profile of the kept records and of
+            those appended from now on, e.g. when switching profiles.
+            Defaults to the current one.
+
+        Returns:
+            The result of save
+        """
+        with self._lock:
+            self._flush_locked()
+            end = self._file.tell() if self._file is not None else None
+        saved = save()
+        with self._lock:
+            if self._file is not None and end is not None:
+                self._file.flush()
+                with open(self.path, "rb") as file_handler:
+                    file_handler.seek(end)
+                    kept = file_handler.read()
+                self.profile = profile or self.profile
+                self._replace(_header(self.profile) + kept)
+        return saved
+
+    def _replace(self, data: bytes) -> None:
+        # Written next to the journal and renamed over it, so a crash leaves
+        # either the old or the new journal, never a truncated one
+        temp_path = f"{self.path}.tmp"
+        new_file = open(temp_path, "wb")
+        if fcntl is not None:
+            # Locked before the rename, so recover never sees it unlocked
+            _try_lock(new_file)
+        new_file.write(data)
+        new_file.flush()
+        os.fsync(new_file.fileno())
+        if fcntl is not None:
+            os.replace(temp_path, self.path)
+            self._file.close()
+            directory = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        else:
+            # Windows can not replace an open file
+            new_file.close()
+            self._file.close()
+            os.replace(temp_path, self.path)
+            new_file = open(self.path, "ab")
+            _try_lock(new_file)
+        self._file = new_file
+        self._dirty = False
+
+    def close(self, save) -> None:
+        """Compacts the journal (see compact), stops appending and deletes
+        it.
+
+        Args:
+            save (Callable[[], int]): See compact
+        """
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.compact(save)
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                os.remove(self.path)
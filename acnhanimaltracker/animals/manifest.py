@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import threading
+from .thumbnail_atlas import ThumbnailAtlas, thumbnail_key
+
+MANIFEST_VERSION = 1
+# Serializes manifest writes, e.g. of the deep verification and a sync
+_lock = threading.RLock()
+
+
+class IntegrityReport:
+    """Result of Manifest.verify.
+
+    Attributes:
+        missing_kinds (list[str]): Kinds without any animal in the store
+        missing (list[Animal]): Animals without a thumbnail
+        corrupt (list[Animal]): Animals with a damaged thumbnail
+    """
+
+    def __init__(self) -> None:
+        self.missing_kinds = []
+        self.missing = []
+        self.corrupt = []
+
+    @property
+    def intact(self) -> bool:
+        return not (self.missing_kinds or self.missing or self.corrupt)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.missing_kinds)} missing kinds, {len(self.missing)} missing and "
+            f"{len(self.corrupt)} corrupt thumbnails"
+        )
+
+
+class Manifest:
+    """Record of the expected local data: length and sha1 of every thumbnail
+    in the atlas plus size and modification time of the atlas file itself.
+
+    The animals themselves are the source of the expected entries: every
+    kind needs animals and every animal a THUMBNAIL_WIDTH thumbnail (the
+    smaller widths are shrunk on the fly if missing, see ThumbnailLoader).
+
+    Writes are serialized and go through a temporary file per thread, so
+    concurrent writers never interleave. A verification only saves its
+    result if the atlas did not change while it was checked.
+
+    Args:
+        root_directory (str): The root directory created in main.py
+    """
+
+    file_name = "acnhanimaltracker/animals/manifest.json"
+
+    def __init__(self, root_directory: str) -> None:
+        self.root_directory = root_directory
+        self.path = os.path.join(root_directory, self.file_name)
+        self.atlas_path = os.path.join(root_directory, ThumbnailAtlas.file_name)
+        self.atlas_stat = None
+        self.thumbnails = {}
+        # Keys found damaged by a deep check, repaired on the next start
+        self.damaged = set()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as file_handler:
+                    data = json.load(file_handler)
+            except ValueError:
+                data = {}
+            if data.get("version") == MANIFEST_VERSION:
+                self.atlas_stat = data["atlas"]
+                self.thumbnails = data["thumbnails"]
+                self.damaged = set(data["damaged"])
+
+    def _current_atlas_stat(self) -> list[int] | None:
+        if not os.path.exists(self.atlas_path):
+            return None
+        stat = os.stat(self.atlas_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def save(self) -> None:
+        temp_path = f"{self.path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with _lock:
+            with open(temp_path, "w") as file_handler:
+                json.dump(
+                    {
+                        "version": MANIFEST_VERSION,
+                        "atlas": self.atlas_stat,
+                        "thumbnails": self.thumbnails,
+                        "damaged": sorted(self.damaged),
+                    },
+                    file_handler,
+                )
+            os.replace(temp_path, self.path)
+
+    def record_atlas(self) -> None:
+        """Records every thumbnail of the current atlas as expected state,
+        e.g. after the atlas was written."""
+        # Taken first: if the atlas is replaced meanwhile, the next
+        # verification sees a changed stat and checks it again
+        self.atlas_stat = self._current_atlas_stat()
+        atlas = ThumbnailAtlas.open(self.root_directory)
+        self.thumbnails = {}
+        self.damaged = set()
+        if atlas is not None:
+            try:
+                for key in atlas.index:
+                    with atlas.get_bytes(key) as data:
+                        self.thumbnails[key] = [len(data), hashlib.sha1(data).hexdigest()]
+            finally:
+                atlas.close()
+        self.save()
+
+    def mark_outdated(self, keys) -> None:
+        """Remembers thumbnails which no longer show the current image (e.g.
+        after a sync without downloads), so the next verification reports
+        them as corrupt and repair downloads them again.
+
+        Args:
+            keys (Iterable[str]): Keys of the thumbnails, see thumbnail_key
+        """
+        self.damaged.update(keys)
+        self.save()
+
+    def verify(self, animal_handler, animal_list, deep: bool = False) -> IntegrityReport:
+        """Checks the local data against the manifest.
+
+        The fast path only stats the atlas: if it is unchanged since the
+        manifest was written, the expected keys are just compared to the
+        manifest. Otherwise the index of the atlas is read and every entry is
+        checked against the file size and its recorded length. Entries the
+        manifest does not know yet (e.g. after a migration) are hashed and
+        recorded. deep additionally compares the sha1 of every thumbnail and
+        remembers damaged ones for the next start. The result is only saved
+        if the atlas is still unchanged afterwards, so a check of an atlas
+        replaced meanwhile never overwrites the manifest of the new one.
+
+        Args:
+            animal_handler (AnimalHandler): Handler of the installation
+            animal_list (list[list[Fish | Bug | SeaCreature]]): The list
+            created by AnimalHandler.load_animals()
+            deep (bool, optional): Compare the sha1 of every thumbnail.
+            Defaults to False.
+
+        Returns:
+            IntegrityReport: What needs to be repaired
+        """
+        report = IntegrityReport()
+        for (animal_class, _), animal_type in zip(animal_handler.animal_directories, animal_list):
+            if not animal_type:
+                report.missing_kinds.append(animal_class.kind)
+        animals = {
+            thumbnail_key(animal.kind, animal.save_name): animal
+            for animal_type in animal_list
+            for animal in animal_type
+        }
+
+        current_stat = self._current_atlas_stat()
+        if not deep and self.atlas_stat is not None and self.atlas_stat == current_stat:
+            keys = self.thumbnails
+            corrupt = set(self.damaged)
+        else:
+            atlas = ThumbnailAtlas.open(self.root_directory)
+            if atlas is None:
+                report.missing = list(animals.values())
+                return report
+            try:
+                keys = atlas.index
+                corrupt = self._check_atlas(atlas, deep)
+            finally:
+                atlas.close()
+            if deep:
+                self.damaged = corrupt
+            else:
+                corrupt |= self.damaged
+            self.atlas_stat = current_stat
+            with _lock:
+                if self._current_atlas_stat() == current_stat:
+                    self.save()
+
+        report.missing = [animal for key, animal in animals.items() if key not in keys]
+        for key in corrupt:
+            # A damaged thumbnail of any width means downloading the animal again
+            animal = animals.get(key.partition("@")[0])
+            if animal is not None and animal not in report.corrupt:
+                report.corrupt.append(animal)
+        return report
+
+    def _check_atlas(self, atlas: ThumbnailAtlas, deep: bool) -> set[str]:
+        file_size = atlas.file_size
+        corrupt = set()
+        for key, (offset, length, _, _) in atlas.index.items():
+            expected = self.thumbnails.get(key)
+            if offset + length > file_size or (expected is not None and expected[0] != length):
+                corrupt.add(key)
+            elif expected is None or deep:
+                with atlas.get_bytes(key) as data:
+                    digest = hashlib.sha1(data).hexdigest()
+                if expected is None:
+                    self.thumbnails[key] = [length, digest]
+                elif expected[1] != digest:
+                    corrupt.add(key)
+        return corrupt
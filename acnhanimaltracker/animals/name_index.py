@@ -0,0 +1,54 @@
+from . import bitset
+
+
+class NameIndex:
+    """Substring search over names for search-as-you-type.
+
+    Every n-gram (n = 1 to {gram_size}) of every lowercased name maps to a
+    bitset over the positions of the names. Short search texts are a single
+    lookup, longer ones intersect the bitsets of their n-grams and only
+    check the few remaining candidates for the whole text.
+
+    Args:
+        names (list[str]): The names, a name's position is its index
+        gram_size (int, optional): Longest indexed n-gram. Defaults to 3.
+    """
+
+    def __init__(self, names: list[str], gram_size: int = 3) -> None:
+        self.names = [name.lower() for name in names]
+        self.gram_size = gram_size
+        self.all_bits = (1 << len(self.names)) - 1
+        positions_by_gram = {}
+        for position, name in enumerate(self.names):
+            grams = {
+                name[start : start + size]
+                for size in range(1, gram_size + 1)
+                for start in range(len(name) - size + 1)
+            }
+            for gram in grams:
+                positions_by_gram.setdefault(gram, []).append(position)
+        self.grams = {gram: bitset.from_positions(positions) for gram, positions in positions_by_gram.items()}
+
+    def search_bits(self, text: str) -> int:
+        """Returns the bitset of all names containing {text} (case
+        insensitive). An empty text matches every name.
+
+        Args:
+            text (str): The search text
+
+        Returns:
+            int: Bitset over the positions of the names
+        """
+        text = text.lower()
+        if not text:
+            return self.all_bits
+        if len(text) <= self.gram_size:
+            return self.grams.get(text, 0)
+        bits = self.all_bits
+        for start in range(len(text) - self.gram_size + 1):
+            bits &= self.grams.get(text[start : start + self.gram_size], 0)
+            if not bits:
+                return 0
+        return bitset.from_positions(
+            position for position in bitset.to_positions(bits) if text in self.names[position]
+        )
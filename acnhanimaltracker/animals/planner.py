@@ -0,0 +1,193 @@
+from datetime import datetime
+import numpy as np
+from .availability import NORTHERN, SOUTHERN
+
+# Relative chance to encounter an animal of a rarity while it is available.
+# Sea creatures have no rarity and count as common.
+RARITY_WEIGHTS = {"Common": 1.0, "Uncommon": 0.5, "Rare": 0.2, "Ultra-rare": 0.05}
+
+
+def _unpack(masks: np.ndarray, size: int) -> np.ndarray:
+    """Expands integer bitmasks into a boolean array of shape (len, size)."""
+    return (masks[:, None] >> np.arange(size)) & 1 == 1
+
+
+class AnimalPlanner:
+    """Plans ahead over the availability of all animals with NumPy.
+
+    Every animal has a 12x24 month-by-hour calendar, the outer product of its
+    month and hour masks. Instead of looping over animals, the masks are
+    unpacked into boolean matrices once and every question is a single
+    vectorized reduction over them (mostly an einsum over the month and hour
+    axes), so the whole calendar is answered in one pass.
+
+    The value of an animal is the better of its price and its surcharge
+    (price-cj for fish, price-flick for bugs), weighted by RARITY_WEIGHTS
+    for the expected bells of a catch.
+
+    Args:
+        catalog (AnimalCatalog): The catalog created by
+        AnimalHandler.build_catalog(), its caught status is read on every
+        query
+    """
+
+    def __init__(self, catalog) -> None:
+        self.catalog = catalog
+        animals = catalog.animals
+        count = len(animals)
+        self.hours = _unpack(np.fromiter((animal.hour_mask for animal in animals), np.int64, count), 24)
+        self.months = {
+            NORTHERN: _unpack(np.fromiter((animal.month_mask for animal in animals), np.int64, count), 12),
+            SOUTHERN: _unpack(
+                np.fromiter((animal.month_mask_southern for animal in animals), np.int64, count), 12
+            ),
+        }
+        self.values = np.fromiter(
+            (max(animal.price, getattr(animal, "surcharge", 0)) for animal in animals), np.float64, count
+        )
+        self.weights = np.fromiter(
+            (RARITY_WEIGHTS.get(getattr(animal, "rarity", None), 1.0) for animal in animals),
+            np.float64,
+            count,
+        )
+
+    def uncaught(self) -> np.ndarray:
+        """Returns a boolean array over the catalog positions, True for every
+        animal not caught yet."""
+        count = len(self.catalog.animals)
+        caught_bits = self.catalog.availability.caught_bits
+        packed = np.frombuffer(caught_bits.to_bytes((count + 7) // 8, "little"), np.uint8)
+        return np.unpackbits(packed, count=count, bitorder="little") == 0
+
+    def calendar(self, hemisphere: str = NORTHERN) -> np.ndarray:
+        """Returns the month-by-hour calendar of every animal.
+
+        Args:
+            hemisphere (str, optional): NORTHERN or SOUTHERN.
+            Defaults to NORTHERN.
+
+        Returns:
+            np.ndarray: Boolean array of shape (animals, 12, 24), True if
+            the animal is available in that month (January = 0) and hour
+        """
+        return self.months[hemisphere][:, :, None] & self.hours[:, None, :]
+
+    def missing_matrix(self, hemisphere: str = NORTHERN) -> np.ndarray:
+        """Returns how many uncaught species are available per month and
+        hour.
+
+        Args:
+            hemisphere (str, optional): NORTHERN or SOUTHERN.
+            Defaults to NORTHERN.
+
+        Returns:
+            np.ndarray: Array of shape (12, 24)
+        """
+        uncaught = self.uncaught()
+        return np.einsum(
+            "nm,nh->mh", self.months[hemisphere][uncaught].astype(np.int64), self.hours[uncaught].astype(np.int64)
+        )
+
+    def leaving(self, month: int | None = None, hemisphere: str = NORTHERN) -> list:
+        """Returns the uncaught animals available in {month} but not in the
+        month after it, i.e. the ones to catch before the month ends.
+
+        Args:
+            month (int, optional): Month of the year (1-12).
+            Defaults to the current month.
+            hemisphere (str, optional): NORTHERN or SOUTHERN.
+            Defaults to NORTHERN.
+
+        Returns:
+            list[Animal]: The animals, most valuable first
+        """
+        month = (month or datetime.now().month) - 1
+        months = self.months[hemisphere]
+        leaving = months[:, month] & ~months[:, (month + 1) % 12] & self.uncaught()
+        positions = np.flatnonzero(leaving)
+        positions = positions[np.argsort(-self.values[positions], kind="stable")]
+        return [self.catalog.animals[position] for position in positions]
+
+    def best_hours(
+        self, month: int | None = None, hemisphere: str = NORTHERN, count: int = 24
+    ) -> list[tuple[int, int]]:
+        """Ranks the hours of a month by the number of uncaught species
+        available in them.
+
+        Args:
+            month (int, optional): Month of the year (1-12).
+            Defaults to the current month.
+            hemisphere (str, optional): NORTHERN or SOUTHERN.
+            Defaults to NORTHERN.
+            count (int, optional): Number of hours returned. Defaults to 24.
+
+        Returns:
+            list[tuple[int, int]]: (hour, uncaught species) pairs, most
+            species first
+        """
+        month = (month or datetime.now().month) - 1
+        species = self.missing_matrix(hemisphere)[month]
+        hours = np.argsort(-species, kind="stable")[:count]
+        return [(int(hour), int(species[hour])) for hour in hours]
+
+    def bells_matrix(
+        self, hemisphere: str = NORTHERN, catches_per_hour: float = 60.0, uncaught_only: bool = False
+    ) -> np.ndarray:
+        """Returns the expected bells per hour for every month and hour: the
+        rarity weighted mean value of the available animals times
+        {catches_per_hour}.
+
+        Args:
+            hemisphere (str, optional): NORTHERN or SOUTHERN.
+            Defaults to NORTHERN.
+            catches_per_hour (float, optional): Catches in an hour of play.
+            Defaults to 60.0.
+            uncaught_only (bool, optional): Only count animals not caught
+            yet. Defaults to False.
+
+        Returns:
+            np.ndarray: Array of shape (12, 24), 0 where nothing is available
+        """
+        weights = self.weights * self.uncaught() if uncaught_only else self.weights
+        months = self.months[hemisphere].astype(np.float64)
+        hours = self.hours.astype(np.float64)
+        weighted_value = np.einsum("n,nm,nh->mh", weights * self.values, months, hours)
+        weight = np.einsum("n,nm,nh->mh", weights, months, hours)
+        return np.divide(weighted_value, weight, out=np.zeros_like(weight), where=weight > 0) * catches_per_hour
+
+    def best_windows(
+        self,
+        month: int | None = None,
+        hemisphere: str = NORTHERN,
+        length: int = 2,
+        count: int = 5,
+        catches_per_hour: float = 60.0,
+    ) -> list[tuple[int, float]]:
+        """Ranks all windows of {length} consecutive hours of a month (also
+        across midnight) by their expected bells per hour.
+
+        Args:
+            month (int, optional): Month of the year (1-12).
+            Defaults to the current month.
+            hemisphere (str, optional): NORTHERN or SOUTHERN.
+            Defaults to NORTHERN.
+            length (int, optional): Hours per window. Defaults to 2.
+            count (int, optional): Number of windows returned. Defaults to 5.
+            catches_per_hour (float, optional): See bells_matrix.
+            Defaults to 60.0.
+
+        Raises:
+            ValueError: If length is not between 1 and 24
+
+        Returns:
+            list[tuple[int, float]]: (first hour, bells per hour) pairs, best
+            window first
+        """
+        if not 1 <= length <= 24:
+            raise ValueError(f"A window has to be 1 to 24 hours long, not {length}")
+        month = (month or datetime.now().month) - 1
+        bells = self.bells_matrix(hemisphere, catches_per_hour)[month]
+        # Row i of the stacked rolls is the hour i after the window start
+        windows = np.stack([np.roll(bells, -offset) for offset in range(length)]).mean(axis=0)
+        starts = np.argsort(-windows, kind="stable")[:count]
+        return [(int(start), float(windows[start])) for start in starts]
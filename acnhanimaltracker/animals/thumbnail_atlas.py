@@ -0,0 +1,247 @@
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+from PIL import Image
+from .image_ingest import THUMBNAIL_WIDTH, resize_to_width
+
+_MAGIC = b"ACNHATL1"
+_HEADER = struct.Struct("<8sQQ")
+
+
+def thumbnail_key(kind: str, save_name: str, width: int = THUMBNAIL_WIDTH) -> str:
+    """Key of a thumbnail inside the atlas, mirroring the old
+    images/<kind>/<save_name>.png layout (e.g.: "fish/arapaima44"). Other
+    widths than THUMBNAIL_WIDTH get a suffix (e.g.: "fish/arapaima44@48")."""
+    if width == THUMBNAIL_WIDTH:
+        return f"{kind}/{save_name}"
+    return f"{kind}/{save_name}@{width}"
+
+
+class ThumbnailAtlas:
+    """Read access to the thumbnail atlas: a single file holding every PNG
+    thumbnail, opened once via mmap.
+
+    File layout:
+    * header: magic, offset and length of the index
+    * the PNG data of all thumbnails, one after another
+    * index: json {key: [offset, length, width, height]}
+
+    Args:
+        path (str): Path of the atlas file
+    """
+
+    file_name = "acnhanimaltracker/animals/images/thumbnails.atlas"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file_handler:
+            self._mmap = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a thumbnail atlas")
+        self.index = json.loads(self._mmap[index_offset : index_offset + index_length])
+
+    @classmethod
+    def exists(cls, root_directory: str) -> bool:
+        """Checks if an installation has an atlas without mapping it.
+
+        Args:
+            root_directory (str): The root directory created in main.py
+        """
+        return os.path.exists(os.path.join(root_directory, cls.file_name))
+
+    @classmethod
+    def open(cls, root_directory: str):
+        """Opens the atlas of an installation. The caller has to close it.
+
+        Args:
+            root_directory (str): The root directory created in main.py
+
+        Returns:
+            ThumbnailAtlas | None: The atlas or None if there is none yet
+        """
+        if not cls.exists(root_directory):
+            return None
+        return cls(os.path.join(root_directory, cls.file_name))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def file_size(self) -> int:
+        """Size of the atlas file in bytes."""
+        return len(self._mmap)
+
+    def get_bytes(self, key: str) -> memoryview:
+        """Returns the PNG data of a thumbnail without copying it.
+
+        Raises:
+            KeyError: If the atlas holds no such thumbnail
+        """
+        offset, length, _, _ = self.index[key]
+        return memoryview(self._mmap)[offset : offset + length]
+
+    def size(self, key: str) -> tuple[int, int]:
+        """Returns (width, height) of a thumbnail without decoding it."""
+        _, _, width, height = self.index[key]
+        return width, height
+
+    def open_image(self, key: str) -> Image.Image:
+        """Decodes a thumbnail.
+
+        Raises:
+            KeyError: If the atlas holds no such thumbnail
+        """
+        return Image.open(io.BytesIO(self.get_bytes(key)))
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+class ThumbnailAtlasWriter:
+    """Writes a new thumbnail atlas. Thumbnails can be added from several
+    threads. The atlas only replaces an existing one on close, so readers
+    never see a half-written file.
+
+    Args:
+        path (str): Path of the atlas file
+        base (ThumbnailAtlas, optional): Existing atlas whose thumbnails are
+        kept unless replaced. Defaults to None.
+    """
+
+    def __init__(self, path: str, base: ThumbnailAtlas | None = None) -> None:
+        self.path = path
+        self._temp_path = f"{path}.tmp"
+        self._lock = threading.Lock()
+        self._file = open(self._temp_path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, 0, 0))
+        self.index = {}
+        self._base = base
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index or (self._base is not None and key in self._base)
+
+    def add(self, key: str, data: bytes, width: int, height: int) -> None:
+        """Appends the PNG data of a thumbnail.
+
+        Args:
+            key (str): See thumbnail_key
+            data (bytes): PNG data
+            width (int): Width of the thumbnail
+            height (int): Height of the thumbnail
+        """
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(data)
+            self.index[key] = [offset, len(data), width, height]
+
+    def add_image(self, key: str, image: Image.Image) -> None:
+        """Encodes an image as PNG and appends it. See add."""
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        self.add(key, buffer.getvalue(), *image.size)
+
+    def close(self) -> None:
+        """Writes the index and replaces the atlas at self.path."""
+        if self._base is not None:
+            for key, (_, _, width, height) in self._base.index.items():
+                if key not in self.index:
+                    self.add(key, bytes(self._base.get_bytes(key)), width, height)
+            self._base.close()
+        index = json.dumps(self.index).encode()
+        index_offset = self._file.tell()
+        self._file.write(index)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, index_offset, len(index)))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+
+    def abort(self) -> None:
+        """Drops the new atlas and keeps the existing one."""
+        if self._base is not None:
+            self._base.close()
+        self._file.close()
+        os.remove(self._temp_path)
+
+
+class ThumbnailLoader:
+    """Opens the thumbnails of animals from the atlas and falls back to the
+    per-file layout images/<kind>/<save_name>.png for missing entries.
+
+    Args:
+        root_directory (str): The root directory created in main.py
+    """
+
+    def __init__(self, root_directory: str) -> None:
+        self.root_directory = root_directory
+        self.atlas = ThumbnailAtlas.open(root_directory)
+
+    def open(self, kind: str, save_name: str, width: int = THUMBNAIL_WIDTH) -> Image.Image:
+        """Decodes the thumbnail of an animal. Thumbnails stored before the
+        width existed are shrunk from the THUMBNAIL_WIDTH one.
+
+        Args:
+            kind (str): The kind of the animal (e.g.: "fish")
+            save_name (str): The save_name of the animal
+            width (int, optional): One of THUMBNAIL_WIDTHS.
+            Defaults to THUMBNAIL_WIDTH.
+        """
+        key = thumbnail_key(kind, save_name, width)
+        if self.atlas is not None and key in self.atlas:
+            return self.atlas.open_image(key)
+        path = f"{self.root_directory}/acnhanimaltracker/animals/images/{key}.png"
+        if width != THUMBNAIL_WIDTH and not os.path.exists(path):
+            with self.open(kind, save_name) as image:
+                return resize_to_width(image, width)
+        return Image.open(path)
+
+
+def migrate_image_directories(root_directory: str) -> int:
+    """Packs the PNG files of the old images/<kind>/ directories into the
+    atlas. Thumbnails already in the atlas are kept, the files are left
+    untouched.
+
+    Args:
+        root_directory (str): The root directory created in main.py
+
+    Returns:
+        int: Number of migrated thumbnails
+    """
+    images_directory = os.path.join(root_directory, "acnhanimaltracker/animals/images")
+    migrated = 0
+    with ThumbnailAtlasWriter(
+        os.path.join(root_directory, ThumbnailAtlas.file_name),
+        ThumbnailAtlas.open(root_directory),
+    ) as writer:
+        for kind in ("fish", "bugs", "sea_creatures"):
+            directory = os.path.join(images_directory, kind)
+            if not os.path.isdir(directory):
+                continue
+            for file in os.listdir(directory):
+                if not file.endswith(".png"):
+                    continue
+                with open(os.path.join(directory, file), "rb") as file_handler:
+                    data = file_handler.read()
+                with Image.open(io.BytesIO(data)) as image:
+                    size = image.size
+                writer.add(thumbnail_key(kind, file[: -len(".png")]), data, *size)
+                migrated += 1
+    return migrated
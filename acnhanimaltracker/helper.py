@@ -1,9 +1,14 @@
 import os
+from .animals.animal_store import AnimalStore
 
 
 def is_folder_structure_intact(root_directory: str) -> bool:
     """Checks if the required folder structure is in tact. If not it's going
-    to create the necessary folders.
+    to create the necessary folders. The animals are either expected in the
+    AnimalStore or in the old pickle directories, which get migrated on the
+    next AnimalHandler.load_animals. Missing or damaged images are no reason
+    for a new installation, they are found and repaired via
+    AnimalHandler.verify_integrity and AnimalHandler.repair.
 
     Args:
         root_directory (str): Root project file
@@ -26,8 +31,7 @@ def is_folder_structure_intact(root_directory: str) -> bool:
         if not os.path.exists(file_path):
             print(f"Found missing directory: {file_path}. Creating directory")
             os.makedirs(file_path)
-    
-    for file_path in file_list:
-        if not os.listdir(file_path):
-            return False
-    return True
\ No newline at end of file
+
+    return not AnimalStore(root_directory).is_empty() or all(
+        os.listdir(file_path) for file_path in file_list[:3]
+    )
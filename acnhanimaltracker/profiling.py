@@ -0,0 +1,155 @@
+import atexit
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+PROFILE_ENVIRONMENT_VARIABLE = "ACNH_PROFILE"
+REPORT_VERSION = 1
+
+_DISABLED = nullcontext()
+
+
+class Profiler:
+    """Opt-in instrumentation of the startup and the hot paths. While
+    disabled, phase() returns a shared no-op context manager, so instrumented
+    code costs next to nothing.
+
+    Every phase is aggregated by name (count, total, min, max), so per-row and
+    per-image phases can be recorded thousands of times. With tracemalloc the
+    current and the peak memory are recorded as well. The report is written
+    as json at exit.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.report_path = None
+        self.started = None
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def enable(self, report_path: str, trace_memory: bool = True) -> None:
+        """Starts recording and writes the report to {report_path} at exit.
+
+        Args:
+            report_path (str): Path of the json report
+            trace_memory (bool, optional): Record the memory via tracemalloc.
+            Defaults to True.
+        """
+        if self.enabled:
+            return
+        self.enabled = True
+        self.report_path = report_path
+        self.started = time.time()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        atexit.register(self.write_report)
+
+    def enable_from_environment(self) -> None:
+        """Enables the profiler if ACNH_PROFILE holds the path of a report."""
+        report_path = os.environ.get(PROFILE_ENVIRONMENT_VARIABLE)
+        if report_path:
+            self.enable(report_path)
+
+    def phase(self, name: str):
+        """Context manager timing a phase, e.g.:
+
+            with profiler.phase("load_animals"):
+                ...
+
+        Args:
+            name (str): Name of the phase in the report
+        """
+        if not self.enabled:
+            return _DISABLED
+        return self._timed(name)
+
+    def timed(self, name: str):
+        """Decorator timing every call of a function as phase {name}, see
+        phase."""
+
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self._timed(name):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Adds a measurement of a phase.
+
+        Args:
+            name (str): Name of the phase in the report
+            seconds (float): Duration of the phase
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                self.timings[name] = [1, seconds, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] = min(timing[2], seconds)
+                timing[3] = max(timing[3], seconds)
+
+    def report(self) -> dict:
+        """Returns the report as json-compatible dict."""
+        with self._lock:
+            phases = {
+                name: {
+                    "count": count,
+                    "total": total,
+                    "mean": total / count,
+                    "min": minimum,
+                    "max": maximum,
+                }
+                for name, (count, total, minimum, maximum) in self.timings.items()
+            }
+        report = {
+            "version": REPORT_VERSION,
+            "started": self.started,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "phases": phases,
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report["memory"] = {"current": current, "peak": peak}
+        return report
+
+    def write_report(self, path: str | None = None) -> None:
+        """Writes the report as json.
+
+        Args:
+            path (str, optional): Path of the report. Defaults to the path
+            given to enable.
+        """
+        path = path or self.report_path
+        if not self.enabled or path is None:
+            return
+        with open(f"{path}.tmp", "w") as file_handler:
+            json.dump(self.report(), file_handler, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+
+profiler = Profiler()
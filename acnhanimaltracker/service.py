@@ -0,0 +1,262 @@
+import asyncio
+import json
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+from .animals import NORTHERN, SOUTHERN
+from .animals.bitset import to_positions
+
+MASK_SLOTS = ("root_directory", "hour_mask", "month_mask", "month_mask_southern")
+ROUTES = ("animals", "catchable", "progress", "profiles")
+FILTERS = ("kind", "name", "location", "shadow", "rarity", "min_price", "max_price", "caught", "available_at", "hemisphere")
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    """Error answered with the given HTTP status and a json message."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def animal_to_json(animal) -> dict:
+    """Returns the attributes of an animal as json-compatible dict with the
+    availability as lists like the API (time, months, months_southern)."""
+    data = {"kind": animal.kind}
+    for slot in animal._state_slots():
+        if slot not in MASK_SLOTS:
+            data[slot] = getattr(animal, slot)
+    data["time"] = animal.time
+    data["months"] = animal.months
+    data["months_southern"] = animal.months_southern
+    return data
+
+
+def _flag(value: str) -> bool:
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise HTTPError(400, f"{value} is not a boolean")
+
+
+class AnimalService:
+    """Local HTTP json API over the loaded animals for dashboards and bots,
+    served by asyncio without starting Tk.
+
+    Routes:
+    * GET /animals: all animals, filtered by the query parameters kind,
+      name, caught, location, shadow, rarity, min_price, max_price, available_at
+      (ISO date) and hemisphere, see AnimalCatalog.query
+    * GET /animals/<kind>/<id>: a single animal
+    * PUT /animals/<kind>/<id> with {"caught": true|false}: sets the status
+    * POST /animals/<kind>/<id>/toggle: switches the status
+    * GET /catchable: animals catchable now (or at=<ISO date>), optionally
+      hemisphere=southern and uncaught=true
+    * GET /progress: caught and total animals per kind
+    * GET /profiles: all profiles and the active one
+
+    Responses of GET requests are cached and the cache is dropped on every
+    change of a caught status and every profile switch. Request bodies
+    larger than {max_body} bytes are refused with 413. Toggles only change the animals in memory, all
+    requests are answered on the event loop one after another, so concurrent
+    toggles never interleave. The changes reach the store through the
+    autosave of the AnimalHandler without blocking any request.
+
+    Args:
+        animal_handler (AnimalHandler): Handler of the installation
+        catalog (AnimalCatalog): The catalog created by
+        AnimalHandler.build_catalog()
+        max_cached (int, optional): Maximum number of cached responses.
+        Defaults to 1024.
+        max_body (int, optional): Maximum size of a request body in bytes.
+        Defaults to 65536.
+    """
+
+    def __init__(self, animal_handler, catalog, max_cached: int = 1024, max_body: int = 65536) -> None:
+        self.animal_handler = animal_handler
+        self.catalog = catalog
+        self.max_cached = max_cached
+        self.max_body = max_body
+        self.cache = {}
+        animal_handler.tracker.subscribe(lambda _: self.cache.clear())
+        # /profiles changes even if both profiles caught the same animals
+        animal_handler.subscribe_profile(lambda _: self.cache.clear())
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """Serves requests until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Serving on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers the requests of one connection (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    body = await reader.readexactly(self._content_length(headers))
+                except HTTPError as error:
+                    # The body is left unread, so the connection can not be reused
+                    await self._respond(writer, error.status, json.dumps({"error": str(error)}).encode(), False)
+                    break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split()
+                    status, payload = 200, await self.handle(method, target, body)
+                except HTTPError as error:
+                    status, payload = error.status, json.dumps({"error": str(error)}).encode()
+                except ValueError as error:
+                    status, payload = 400, json.dumps({"error": str(error)}).encode()
+                except Exception as error:
+                    status, payload = 500, json.dumps({"error": repr(error)}).encode()
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _content_length(self, headers: dict[str, str]) -> int:
+        """Returns the validated size of the request body.
+
+        Raises:
+            HTTPError: If the size is malformed or larger than max_body
+        """
+        value = headers.get("content-length", "0")
+        # Chunked bodies are not supported
+        if not (value.isascii() and value.isdigit()) or "transfer-encoding" in headers:
+            raise HTTPError(400, f"Invalid request body length: {value}")
+        length = int(value)
+        if length > self.max_body:
+            raise HTTPError(413, f"Request body larger than {self.max_body} bytes")
+        return length
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: bytes, keep_alive: bool) -> None:
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+            + payload
+        )
+        await writer.drain()
+
+    async def handle(self, method: str, target: str, body: bytes) -> bytes:
+        """Routes a request and returns the json body of the response.
+
+        Raises:
+            HTTPError: If the request can not be answered
+        """
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if method == "GET":
+            key = self._cache_key(parts, query)
+            payload = self.cache.get(key)
+            if payload is None:
+                payload = json.dumps(await self.get(parts, query)).encode()
+                if len(self.cache) >= self.max_cached:
+                    self.cache.clear()
+                self.cache[key] = payload
+            return payload
+        if method == "PUT" and len(parts) == 3 and parts[0] == "animals":
+            animal = self._animal(parts[1], parts[2])
+            payload = json.loads(body or b"{}")
+            caught = payload.get("caught") if isinstance(payload, dict) else None
+            if not isinstance(caught, bool):
+                raise HTTPError(400, 'Expected a body like {"caught": true}')
+            animal.set_caught_status(caught)
+            return json.dumps(animal_to_json(animal)).encode()
+        if method == "POST" and len(parts) == 4 and parts[0] == "animals" and parts[3] == "toggle":
+            animal = self._animal(parts[1], parts[2])
+            animal.switch_caught_status()
+            return json.dumps(animal_to_json(animal)).encode()
+        status = 405 if parts and parts[0] in ROUTES else 404
+        raise HTTPError(status, f"{method} {url.path} is not supported")
+
+    def _cache_key(self, parts: list[str], query: dict[str, str]) -> tuple:
+        key = (tuple(parts), tuple(sorted(query.items())))
+        if parts == ["catchable"] and "at" not in query:
+            # "now" only changes the answer once an hour
+            key += (datetime.now().strftime("%Y-%m-%d %H"),)
+        return key
+
+    def _animal(self, kind: str, animal_id: str):
+        try:
+            return self.catalog.get(kind, int(animal_id))
+        except (KeyError, ValueError):
+            raise HTTPError(404, f"There is no animal {kind}/{animal_id}") from None
+
+    async def get(self, parts: list[str], query: dict[str, str]):
+        """Answers a GET request with a json-compatible object."""
+        if parts == ["animals"]:
+            return [animal_to_json(animal) for animal in self.catalog.query(**self._filters(query))]
+        if len(parts) == 3 and parts[0] == "animals":
+            return animal_to_json(self._animal(parts[1], parts[2]))
+        if parts == ["catchable"]:
+            hemisphere = query.get("hemisphere", NORTHERN)
+            if hemisphere not in (NORTHERN, SOUTHERN):
+                raise HTTPError(400, f"{hemisphere} is not a valid hemisphere")
+            when = datetime.fromisoformat(query["at"]) if "at" in query else None
+            animals = self.catalog.availability.catchable(
+                when, hemisphere, _flag(query.get("uncaught", "false"))
+            )
+            return [animal_to_json(animal) for animal in animals]
+        if parts == ["progress"]:
+            caught_bits = self.catalog.availability.caught_bits
+            return {
+                kind: {
+                    "caught": len(to_positions(bits & caught_bits)),
+                    "total": len(to_positions(bits)),
+                }
+                for kind, bits in self.catalog.inverted["kind"].items()
+            }
+        if parts == ["profiles"]:
+            store = self.animal_handler.store
+            loop = asyncio.get_running_loop()
+            # SQLite reads run in a worker thread to keep the loop responsive
+            profiles = await loop.run_in_executor(None, store.profiles)
+            active_profile = await loop.run_in_executor(None, store.active_profile)
+            return {"active": active_profile, "profiles": profiles}
+        raise HTTPError(404, f"/{'/'.join(parts)} does not exist")
+
+    def _filters(self, query: dict[str, str]) -> dict:
+        filters = {}
+        for name in ("kind", "name", "location", "shadow", "rarity"):
+            if name in query:
+                filters[name] = query[name]
+        for name in ("min_price", "max_price"):
+            if name in query:
+                filters[name] = int(query[name])
+        if "caught" in query:
+            filters["caught"] = _flag(query["caught"])
+        if "available_at" in query:
+            filters["available_at"] = datetime.fromisoformat(query["available_at"])
+        if "hemisphere" in query:
+            if query["hemisphere"] not in (NORTHERN, SOUTHERN):
+                raise HTTPError(400, f"{query['hemisphere']} is not a valid hemisphere")
+            filters["hemisphere"] = query["hemisphere"]
+        unknown = set(query) - set(FILTERS)
+        if unknown:
+            raise HTTPError(400, f"Unknown filters: {', '.join(sorted(unknown))}")
+        return filters
@@ -0,0 +1,283 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from acnhanimaltracker.animals import AnimalHandler, ColumnarCatalog
+from acnhanimaltracker.animals.image_ingest import make_thumbnail, make_thumbnails
+from acnhanimaltracker.helper import is_folder_structure_intact
+from .synthetic import synthetic_catalog, synthetic_image
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# Thumbnails the StartPage shows, needed by the GUI benchmark
+START_PAGE_THUMBNAILS = (("fish", "arapaima44"), ("bugs", "centipede77"), ("sea_creatures", "vampire squid22"))
+
+
+class SyntheticHandler(AnimalHandler):
+    """AnimalHandler answering the API requests from a synthetic catalog
+    instead of the network, so the benchmarks measure the local work only.
+
+    Args:
+        root_directory (str): The root directory of the benchmark installation
+        catalog (dict): The catalog created by synthetic_catalog
+    """
+
+    def __init__(self, root_directory: str, catalog: dict) -> None:
+        super().__init__(root_directory)
+        self.catalog = catalog
+        self.endpoint_kinds = {
+            self.fish_api_endpoint: "fish",
+            self.bug_api_endpoint: "bugs",
+            self.sea_api_endpoint: "sea_creatures",
+        }
+
+    def send_request(self, endpoint: str) -> dict:
+        return self.catalog[self.endpoint_kinds[endpoint]]
+
+
+class Benchmark:
+    """A single measurement. setup prepares the argument of function outside
+    of the measurement, teardown cleans up after it.
+
+    Args:
+        name (str): Name in the report and the baselines
+        function (Callable): The measured code, called with the result of setup
+        items (int): Number of processed items (animals, images, ...) for the
+        throughput
+        setup (Callable, optional): Defaults to None.
+        teardown (Callable, optional): Called with the result of function.
+        Defaults to None.
+    """
+
+    def __init__(self, name, function, items, setup=None, teardown=None) -> None:
+        self.name = name
+        self.function = function
+        self.items = items
+        self.setup = setup or (lambda: None)
+        self.teardown = teardown or (lambda _: None)
+
+    def measure(self, trace_memory: bool) -> dict:
+        """Runs the benchmark once for the time and, with trace_memory, once
+        more under tracemalloc for the peak memory (tracemalloc slows down
+        the code, so both are never measured in the same run).
+
+        Returns:
+            dict: seconds, items, per_second and peak_bytes (or None)
+        """
+        argument = self.setup()
+        start = time.perf_counter()
+        result = self.function(argument)
+        seconds = time.perf_counter() - start
+        self.teardown(result)
+
+        peak_bytes = None
+        if trace_memory:
+            argument = self.setup()
+            tracemalloc.start()
+            try:
+                base = tracemalloc.get_traced_memory()[0]
+                result = self.function(argument)
+                peak_bytes = tracemalloc.get_traced_memory()[1] - base
+            finally:
+                tracemalloc.stop()
+            self.teardown(result)
+        return {
+            "seconds": seconds,
+            "items": self.items,
+            "per_second": self.items / seconds if seconds else None,
+            "peak_bytes": peak_bytes,
+        }
+
+
+def display_available() -> bool:
+    """Checks if Tk can open a window, e.g. under xvfb-run."""
+    try:
+        import tkinter
+
+        tkinter.Tk().destroy()
+    except Exception:
+        return False
+    return True
+
+
+def write_thumbnails(handler: AnimalHandler, animal_list: list, count: int) -> None:
+    """Adds generated thumbnails of the first {count} animals of every kind
+    plus the ones of the StartPage to the atlas."""
+    with handler.open_atlas_writer() as writer:
+        animals = [animal for animal_type in animal_list for animal in animal_type[:count]]
+        for animal in animals:
+            handler._write_thumbnails(animal, make_thumbnails(synthetic_image(animal.id)))
+        for index, (kind, save_name) in enumerate(START_PAGE_THUMBNAILS):
+            writer.add(f"{kind}/{save_name}", *make_thumbnail(synthetic_image(index)))
+
+
+def benchmarks_for_size(size: int, root_directory: str, images: int, gui: bool) -> list[Benchmark]:
+    """Creates the benchmarks of one catalog size. They share one benchmark
+    installation and have to run in the returned order."""
+    catalog = synthetic_catalog(size)
+    handler = SyntheticHandler(root_directory, catalog)
+    api_responses = [
+        (handler.animal_classes[kind], api_response)
+        for kind, response in catalog.items()
+        for api_response in response.values()
+    ]
+    columnar_path = os.path.join(root_directory, ColumnarCatalog.file_name)
+    state = {}
+
+    def drop_columnar():
+        if os.path.exists(columnar_path):
+            os.remove(columnar_path)
+
+    def loaded_animals():
+        if "animal_list" not in state:
+            state["animal_list"] = handler.load_animals()
+        return state["animal_list"]
+
+    def toggle_some():
+        animal_list = loaded_animals()
+        for animal_type in animal_list:
+            for animal in animal_type[::100]:
+                animal.switch_caught_status()
+
+    sample = [synthetic_image(animal_id) for animal_id in range(min(size, images))]
+
+    benchmarks = [
+        Benchmark(
+            "construct",
+            lambda _: [animal_class(api_response, root_directory) for animal_class, api_response in api_responses],
+            size,
+        ),
+        Benchmark("reset_animals", lambda _: handler.reset_animals(True, True, True), size),
+        Benchmark("load_animals_store", lambda _: handler.load_animals(), size, setup=drop_columnar),
+        Benchmark("load_animals_columnar", lambda _: handler.load_animals(), size),
+        Benchmark("save_animals", handler.save_animals, size, setup=loaded_animals),
+        Benchmark("save_changes", lambda _: handler.save_changes(), (size + 99) // 100, setup=toggle_some),
+        Benchmark("resize_images", lambda _: [make_thumbnail(data) for data in sample], len(sample)),
+        Benchmark("resize_images_multi", lambda _: [make_thumbnails(data) for data in sample], len(sample)),
+    ]
+    if gui:
+        from acnhanimaltracker.GUI import AnimalPage, Application
+
+        def open_application():
+            animal_list = loaded_animals()
+            if "thumbnails" not in state:
+                write_thumbnails(handler, animal_list, AnimalPage.prefetch)
+                state["thumbnails"] = True
+            return Application(animal_list, root_directory, handler.build_catalog(animal_list))
+
+        def populate_pages(application):
+            for kind in application.page_classes:
+                page = application.get_page(kind)
+                page.populate()
+                page.load_visible(0.0, 0.0)
+            application.update_idletasks()
+            return application
+
+        benchmarks.append(
+            Benchmark(
+                "gui_populate",
+                populate_pages,
+                size,
+                setup=open_application,
+                teardown=lambda application: application.destroy(),
+            )
+        )
+    return benchmarks
+
+
+def compare(results: dict, baselines: dict, tolerance: float) -> list[str]:
+    """Returns a message for every result slower or larger than its baseline
+    by more than {tolerance} (e.g.: 0.25 = 25%)."""
+    regressions = []
+    for size, measurements in results.items():
+        for name, result in measurements.items():
+            baseline = baselines.get(size, {}).get(name)
+            if baseline is None:
+                continue
+            for key in ("seconds", "peak_bytes"):
+                if result[key] is None or not baseline.get(key):
+                    continue
+                ratio = result[key] / baseline[key]
+                if ratio > 1 + tolerance:
+                    regressions.append(f"{size} {name}: {key} {ratio:.2f}x of the baseline")
+    return regressions
+
+
+def print_results(results: dict, baselines: dict) -> None:
+    print(f"{'size':>8} {'benchmark':<22} {'seconds':>10} {'items/s':>12} {'peak MiB':>9} {'vs base':>8}")
+    for size, measurements in results.items():
+        for name, result in measurements.items():
+            baseline = baselines.get(size, {}).get(name)
+            ratio = f"{result['seconds'] / baseline['seconds']:.2f}x" if baseline else "-"
+            peak = "-" if result["peak_bytes"] is None else f"{result['peak_bytes'] / 2**20:.1f}"
+            per_second = "-" if result["per_second"] is None else f"{result['per_second']:.0f}"
+            print(f"{size:>8} {name:<22} {result['seconds']:>10.4f} {per_second:>12} {peak:>9} {ratio:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks on synthetic catalogs")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="catalog sizes to benchmark (up to 1000000)",
+    )
+    parser.add_argument("--images", type=int, default=100, help="images resized per size")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--gui", choices=["auto", "on", "off"], default="auto", help="page population benchmark")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="json file with the baselines")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as new baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    parser.add_argument("--output", metavar="PATH", help="write the results as json")
+    args = parser.parse_args()
+
+    gui = args.gui == "on" or (args.gui == "auto" and display_available())
+    if not gui:
+        print("Skipping gui_populate: no display (run under xvfb-run to include it)")
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file_handler:
+            baselines = json.load(file_handler)["results"]
+
+    results = {}
+    for size in args.sizes:
+        root_directory = tempfile.mkdtemp(prefix=f"acnh-benchmark-{size}-")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                is_folder_structure_intact(root_directory)
+            results[str(size)] = {
+                benchmark.name: benchmark.measure(not args.no_memory)
+                for benchmark in benchmarks_for_size(size, root_directory, args.images, gui)
+            }
+        finally:
+            shutil.rmtree(root_directory)
+
+    print_results(results, baselines)
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file_handler:
+            json.dump(report, file_handler, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w") as file_handler:
+            json.dump(report, file_handler, indent=2)
+        print(f"Stored the results as baselines in {args.baseline}")
+    else:
+        regressions = compare(results, baselines, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise SystemExit(1)
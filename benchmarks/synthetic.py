@@ -0,0 +1,108 @@
+import io
+import random
+from PIL import Image, ImageDraw
+
+LOCATIONS = ["River", "Pond", "Sea", "Pier", "River (Clifftop)", "Flying", "On trees", "On the ground"]
+SHADOWS = ["Smallest (1)", "Small (2)", "Medium (4)", "Large (5)", "Largest (6)"]
+RARITIES = ["Common", "Uncommon", "Rare", "Ultra-rare"]
+SPEEDS = ["Stationary", "Very slow", "Slow", "Medium", "Fast", "Very fast"]
+
+# Share of every kind in a catalog, roughly like the real API (80/80/40)
+KIND_SHARES = (("fish", 0.4), ("bugs", 0.4), ("sea_creatures", 0.2))
+
+
+def synthetic_api_response(animal_id: int, kind: str, rng: random.Random) -> dict:
+    """Creates a json-response shaped like the one of
+    https://acnhapi.com/v1/{endpoint}/{id} with random values.
+
+    Args:
+        animal_id (int): Id of the animal
+        kind (str): The kind of the animal (e.g.: "fish")
+        rng (random.Random): Source of the random values
+
+    Returns:
+        dict: The json-response
+    """
+    start = rng.randrange(24)
+    hours = sorted({(start + hour) % 24 for hour in range(rng.randrange(1, 25))})
+    months = sorted(rng.sample(range(1, 13), rng.randrange(1, 13)))
+    name = f"{kind} {animal_id}"
+    api_response = {
+        "id": animal_id,
+        "file-name": f"{kind}_{animal_id}",
+        "name": {"name-USen": name, "name-EUen": name, "name-EUde": name, "name-JPja": name},
+        "availability": {
+            "month-northern": "",
+            "month-southern": "",
+            "time": "" if len(hours) == 24 else f"{hours[0]}h - {hours[-1]}h",
+            "isAllDay": len(hours) == 24,
+            "isAllYear": len(months) == 12,
+            "location": rng.choice(LOCATIONS),
+            "rarity": rng.choice(RARITIES),
+            "month-array-northern": months,
+            "month-array-southern": [(month + 5) % 12 + 1 for month in months],
+            "time-array": hours,
+        },
+        "shadow": rng.choice(SHADOWS),
+        "speed": rng.choice(SPEEDS),
+        "price": rng.randrange(10, 20000),
+        "price-cj": rng.randrange(10, 30000),
+        "price-flick": rng.randrange(10, 30000),
+        "catch-phrase": f"I caught {name}!",
+        "museum-phrase": f"The {name} is a synthetic animal generated for benchmarks. " * 4,
+        "image_uri": f"http://localhost/images/{kind}/{animal_id}",
+        "icon_uri": f"http://localhost/icons/{kind}/{animal_id}",
+    }
+    if kind == "sea_creatures":
+        del api_response["availability"]["location"]
+        del api_response["availability"]["rarity"]
+    return api_response
+
+
+def synthetic_catalog(size: int, seed: int = 0) -> dict[str, dict[str, dict]]:
+    """Creates the responses of all three endpoints for a catalog of {size}
+    animals, split like KIND_SHARES. The same size and seed always create
+    the same catalog.
+
+    Args:
+        size (int): Total number of animals
+        seed (int, optional): Seed of the random values. Defaults to 0.
+
+    Returns:
+        dict[str, dict[str, dict]]: Maps every kind to the response of its
+        endpoint ({file-name: api_response})
+    """
+    rng = random.Random(seed)
+    catalog = {}
+    remaining = size
+    for index, (kind, share) in enumerate(KIND_SHARES):
+        count = remaining if index == len(KIND_SHARES) - 1 else int(size * share)
+        remaining -= count
+        api_responses = (synthetic_api_response(animal_id, kind, rng) for animal_id in range(1, count + 1))
+        catalog[kind] = {api_response["file-name"]: api_response for api_response in api_responses}
+    return catalog
+
+
+def synthetic_image(animal_id: int, size: tuple[int, int] = (600, 600)) -> bytes:
+    """Creates a PNG shaped like the images of the API: a colored shape on a
+    transparent background.
+
+    Args:
+        animal_id (int): Id of the animal, selects the color
+        size (tuple[int, int], optional): Size of the image.
+        Defaults to (600, 600).
+
+    Returns:
+        bytes: PNG data
+    """
+    rng = random.Random(animal_id)
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    width, height = size
+    for _ in range(8):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+        left, top = rng.randrange(width // 2), rng.randrange(height // 2)
+        draw.ellipse((left, top, left + width // 2, top + height // 2), fill=color)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
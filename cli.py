@@ -0,0 +1,251 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+from acnhanimaltracker.animals import AnimalHandler, NORTHERN, SOUTHERN
+
+EXPORT_FIELDS = ("kind", "id", "name", "caught")
+
+
+def select_animals(catalog, args) -> list:
+    """Returns all animals matching the selectors of a set or clear command.
+    Animals given by --id or --name are combined with the filter options
+    (--kind, --location, ...), which also select on their own.
+
+    Args:
+        catalog (AnimalCatalog): The catalog of all animals
+        args (argparse.Namespace): The parsed command line
+
+    Raises:
+        ValueError: If an id or name does not exist
+    """
+    filters = {
+        name: getattr(args, name)
+        for name in ("kind", "location", "shadow", "rarity", "min_price", "max_price")
+        if getattr(args, name) is not None
+    }
+    if args.available_now:
+        filters["available_at"] = datetime.now()
+        filters["hemisphere"] = args.hemisphere
+    if not (args.id or args.name or filters or args.all):
+        raise ValueError("Select animals with --id, --name, --all or a filter like --kind")
+
+    selected = {}
+    for key in args.id or []:
+        kind, _, animal_id = key.rpartition(":")
+        if not kind:
+            raise ValueError(f"{key} is no id like fish:12")
+        try:
+            animal = catalog.get(kind, int(animal_id))
+        except (KeyError, ValueError):
+            raise ValueError(f"There is no animal {key}") from None
+        selected[(animal.kind, animal.id)] = animal
+    for name in args.name or []:
+        animals = catalog.find_by_name(name)
+        if not animals:
+            raise ValueError(f"There is no animal named {name}")
+        for animal in animals:
+            selected[(animal.kind, animal.id)] = animal
+    if selected:
+        # Filters narrow down explicitly named animals
+        if filters:
+            matching = {(animal.kind, animal.id) for animal in catalog.query(**filters)}
+            return [animal for key, animal in selected.items() if key in matching]
+        return list(selected.values())
+    return catalog.query(**filters)
+
+
+def guess_format(path: str) -> str:
+    """Format of a progress file by its extension, csv for stdin/stdout."""
+    if path == "-":
+        return "csv"
+    return os.path.splitext(path)[1].lstrip(".").lower()
+
+
+def read_progress(path: str, file_format: str | None = None) -> list[dict]:
+    """Reads progress written by write_progress (or by hand) as csv or json.
+    Every entry needs kind and id or a name, caught defaults to true.
+
+    Args:
+        path (str): Path of the file, "-" for stdin
+        file_format (str, optional): "csv" or "json". Defaults to the file
+        extension, csv for stdin.
+    """
+    file_format = file_format or guess_format(path)
+    with open(path, newline="") if path != "-" else contextlib.nullcontext(sys.stdin) as file_handler:
+        if file_format == "json":
+            entries = json.load(file_handler)
+            if not isinstance(entries, list):
+                raise ValueError("Expected a json list of animals")
+            return entries
+        if file_format == "csv":
+            return list(csv.DictReader(file_handler))
+    raise ValueError(f"Unknown format {file_format}, use --format csv or json")
+
+
+def write_progress(path: str, animals: list, file_format: str | None = None) -> None:
+    """Writes kind, id, name and caught status of the animals as csv or json.
+
+    Args:
+        path (str): Path of the file, "-" for stdout
+        animals (list[Animal]): The animals to export
+        file_format (str, optional): "csv" or "json". Defaults to the file
+        extension, csv for stdout.
+    """
+    file_format = file_format or guess_format(path)
+    rows = [
+        {"kind": animal.kind, "id": animal.id, "name": animal.name, "caught": animal.caught}
+        for animal in animals
+    ]
+    if file_format not in ("csv", "json"):
+        raise ValueError(f"Unknown format {file_format}, use --format csv or json")
+    with open(path, "w", newline="") if path != "-" else contextlib.nullcontext(sys.stdout) as file_handler:
+        if file_format == "json":
+            json.dump(rows, file_handler, indent=2)
+        else:
+            writer = csv.DictWriter(file_handler, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def apply_progress(catalog, entries: list[dict]) -> int:
+    """Sets the caught status of every imported entry.
+
+    Returns:
+        int: Number of animals whose status changed
+
+    Raises:
+        ValueError: If an entry is no object or matches no animal
+    """
+    changed = 0
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError(f"Expected an object with kind and id or a name, got {entry!r}")
+        caught = entry.get("caught", True)
+        if isinstance(caught, str):
+            caught = caught.strip().lower() in ("1", "true", "yes", "x")
+        if entry.get("kind") and entry.get("id") not in (None, ""):
+            try:
+                animals = [catalog.get(entry["kind"], int(entry["id"]))]
+            except (KeyError, ValueError):
+                raise ValueError(f"There is no animal {entry['kind']}:{entry['id']}") from None
+        else:
+            animals = catalog.find_by_name(entry.get("name") or "")
+            if not animals:
+                raise ValueError(f"There is no animal matching {entry}")
+        for animal in animals:
+            if animal.caught != bool(caught):
+                animal.set_caught_status(bool(caught))
+                changed += 1
+    return changed
+
+
+def print_summary(animal_handler, catalog) -> None:
+    """Prints the progress per kind and what is catchable right now."""
+    print(f"Profile: {animal_handler.profile}")
+    for kind in animal_handler.animal_classes:
+        total = len(catalog.query(kind=kind))
+        caught = len(catalog.query(kind=kind, caught=True))
+        print(f"{kind:<14} {caught:>5}/{total:<5} caught")
+    for hemisphere in (NORTHERN, SOUTHERN):
+        missing = catalog.availability.catchable(hemisphere=hemisphere, uncaught_only=True)
+        print(f"Uncaught and catchable now ({hemisphere}): {len(missing)}")
+
+
+def print_plan(catalog, args) -> None:
+    """Prints the uncaught animals leaving after the month, the hours with
+    the most uncaught species and the best bells-per-hour windows."""
+    # Imported here, numpy would slow down every other command
+    from acnhanimaltracker.animals.planner import AnimalPlanner
+
+    planner = AnimalPlanner(catalog)
+    month = args.month or datetime.now().month
+    print(f"Uncaught and leaving after month {month} ({args.hemisphere}):")
+    for animal in planner.leaving(month, args.hemisphere):
+        print(f"  {animal.kind:<14} {animal.name}")
+    print("Hours with the most uncaught species:")
+    for hour, species in planner.best_hours(month, args.hemisphere, args.count):
+        print(f"  {hour:02d}:00 {species:>5}")
+    print(f"Best {args.length} hour windows by bells per hour:")
+    for start, bells in planner.best_windows(month, args.hemisphere, args.length, args.count):
+        print(f"  {start:02d}:00 - {(start + args.length) % 24:02d}:00 {bells:>12,.0f}")
+
+
+def add_selectors(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--id", action="append", metavar="KIND:ID", help="e.g. fish:12, repeatable")
+    parser.add_argument("--name", action="append", help="e.g. 'sea bass', repeatable")
+    parser.add_argument("--all", action="store_true", help="every animal")
+    parser.add_argument("--kind", choices=list(AnimalHandler.animal_classes))
+    parser.add_argument("--location")
+    parser.add_argument("--shadow")
+    parser.add_argument("--rarity")
+    parser.add_argument("--min-price", type=int)
+    parser.add_argument("--max-price", type=int)
+    parser.add_argument("--available-now", action="store_true", help="only animals catchable right now")
+    parser.add_argument("--hemisphere", choices=[NORTHERN, SOUTHERN], default=NORTHERN)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Animal Crossing New Horizons - Animal Tracker - batch updates without the GUI"
+    )
+    parser.add_argument(
+        # Same flag and meaning as in main.py
+        "--player",
+        metavar="NAME",
+        help="work on the progress of NAME (created if it does not exist) instead of the active "
+        "profile, without switching the profile the GUI opens",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_selectors(commands.add_parser("set", help="mark animals as caught"))
+    add_selectors(commands.add_parser("clear", help="mark animals as not caught"))
+    import_parser = commands.add_parser("import", help="apply progress from a csv or json file")
+    import_parser.add_argument("path", help='file to read, "-" for stdin (csv unless --format json)')
+    import_parser.add_argument("--format", choices=["csv", "json"])
+    export_parser = commands.add_parser("export", help="write the progress as csv or json")
+    export_parser.add_argument("path", help='file to write, "-" for stdout (csv unless --format json)')
+    export_parser.add_argument("--format", choices=["csv", "json"])
+    commands.add_parser("summary", help="print the progress per kind")
+    plan_parser = commands.add_parser(
+        "plan", help="what leaves after this month and when to catch or earn the most"
+    )
+    plan_parser.add_argument("--month", type=int, choices=range(1, 13), metavar="1-12")
+    plan_parser.add_argument("--hemisphere", choices=[NORTHERN, SOUTHERN], default=NORTHERN)
+    plan_parser.add_argument(
+        "--length", type=int, choices=range(1, 25), default=2, metavar="1-24", help="hours per bells window"
+    )
+    plan_parser.add_argument("--count", type=int, default=5, help="hours and windows to list")
+    args = parser.parse_args()
+
+    animal_handler = AnimalHandler(os.path.dirname(os.path.abspath(__file__)))
+    if animal_handler.store.is_empty():
+        parser.exit(1, "No animals yet, run main.py once to download them\n")
+    if args.player and args.player not in animal_handler.store.profiles():
+        animal_handler.store.create_profile(args.player)
+    # Saved into the same profile by save_changes, the active profile is left alone
+    animal_list = animal_handler.load_animals(args.player)
+    catalog = animal_handler.build_catalog(animal_list)
+
+    try:
+        if args.command in ("set", "clear"):
+            changed = 0
+            for animal in select_animals(catalog, args):
+                if animal.caught != (args.command == "set"):
+                    animal.set_caught_status(args.command == "set")
+                    changed += 1
+            print(f"{changed} animals changed")
+        elif args.command == "import":
+            print(f"{apply_progress(catalog, read_progress(args.path, args.format))} animals changed")
+        elif args.command == "export":
+            write_progress(args.path, catalog.animals, args.format)
+        elif args.command == "plan":
+            print_plan(catalog, args)
+        else:
+            print_summary(animal_handler, catalog)
+    except (ValueError, OSError) as error:
+        parser.exit(2, f"{error}\n")
+    # All changes of this run in one transaction
+    animal_handler.save_changes()
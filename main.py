@@ -1,24 +1,131 @@
+import argparse
+import asyncio
 import os
-from concurrent.futures import ThreadPoolExecutor
-from acnhanimaltracker.animals import AnimalHandler
-from acnhanimaltracker.GUI import Application
+from acnhanimaltracker.animals import AnimalHandler, ThumbnailAtlas
+from acnhanimaltracker.animals.bootstrap import stream_bootstrap
+from acnhanimaltracker.animals.bundle import bootstrap_from_bundle, build_bundle
 from acnhanimaltracker.helper import is_folder_structure_intact
+from acnhanimaltracker.service import AnimalService
+from acnhanimaltracker.profiling import PROFILE_ENVIRONMENT_VARIABLE, profiler
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Animal Crossing New Horizons - Animal Tracker")
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="update the catalog and images from the API while keeping your progress",
+    )
+    parser.add_argument(
+        "--bundle",
+        metavar="PATH",
+        help="set up a new installation from an archive instead of the API",
+    )
+    parser.add_argument(
+        "--build-bundle",
+        metavar="PATH",
+        help="pack the catalog and images of this installation into an archive and exit",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help=f"time the startup and hot paths and write a json report to PATH at exit "
+        f"(or set {PROFILE_ENVIRONMENT_VARIABLE}=PATH)",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="PORT",
+        type=int,
+        nargs="?",
+        const=8080,
+        help="serve the animals as local json API on PORT (default 8080) instead of starting the GUI",
+    )
+    parser.add_argument(
+        # Same flag and meaning as in cli.py
+        "--player",
+        metavar="NAME",
+        help="track the progress of the profile NAME (created if it does not exist) for this run, "
+        "without switching the profile the next start opens",
+    )
+    parser.add_argument(
+        "--list-profiles",
+        action="store_true",
+        help="list all profiles and how many animals nobody has caught yet, then exit",
+    )
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable(args.profile)
+    else:
+        profiler.enable_from_environment()
+
     root_directory = os.path.dirname(__file__)
+    if args.build_bundle:
+        build_bundle(AnimalHandler(root_directory), args.build_bundle)
+        raise SystemExit
+
+    if args.list_profiles:
+        store = AnimalHandler(root_directory).store
+        active_profile = store.active_profile()
+        for name in store.profiles():
+            caught = len(store.load_caught(name))
+            print(f"{'*' if name == active_profile else ' '} {name}: {caught} caught")
+        nobody = store.caught_by_nobody()
+        print(f"Caught by nobody: {sum(len(ids) for ids in nobody.values())}")
+        raise SystemExit
+
     if not is_folder_structure_intact(root_directory):
         animal_handler = AnimalHandler(root_directory)
-        animal_handler.reset_animals(True, True, True)
-        animal_list = animal_handler.load_animals()
-        for animal_type in animal_list:
-            with ThreadPoolExecutor(max_workers=50) as executor:
-                executor.map(animal_handler.download_animal_images, animal_type)
+        if args.bundle:
+            bootstrap_from_bundle(animal_handler, args.bundle)
+            animal_list = animal_handler.load_animals()
+        else:
+            with profiler.phase("stream_bootstrap"):
+                animal_list = stream_bootstrap(animal_handler)
+    elif args.bundle:
+        parser.exit(1, f"{root_directory} is set up already, --bundle only sets up new installations\n")
     else:
         animal_handler = AnimalHandler(root_directory)
         # animal_handler.reset_animals(True, True, True)
         animal_list = animal_handler.load_animals()
         # animal_handler.download_images(animal_list)
+        if not ThumbnailAtlas.exists(root_directory):
+            with profiler.phase("migrate_images"):
+                animal_handler.migrate_images()
+        with profiler.phase("verify_integrity"):
+            report = animal_handler.verify_integrity(animal_list)
+        if not report.intact:
+            print(f"Repairing {report}")
+            animal_list = animal_handler.repair(animal_list, report)
+        if args.sync:
+            animal_handler.sync_animals(animal_list)
+        # Only after the atlas is final, sync and repair rewrite it
+        animal_handler.start_deep_verification(animal_list)
+
+    # Restores the toggles of a session that ended without saving
+    animal_handler.open_journal(animal_list)
+    if args.player:
+        animal_handler.switch_profile(args.player, animal_list, create=True, persist=False)
+    if args.serve is not None:
+        # Toggles are persisted by the autosave, the service never waits for the store
+        animal_handler.start_autosave(interval=1.0)
+        service = AnimalService(animal_handler, animal_handler.build_catalog(animal_list))
+        try:
+            asyncio.run(service.serve(port=args.serve))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            animal_handler.stop_autosave()
+            animal_handler.close_journal()
+        raise SystemExit
+
+    # Tk is only needed for the GUI
+    from acnhanimaltracker.GUI import Application
 
-    app = Application(animal_list, root_directory)
+    animal_handler.start_autosave()
+    with profiler.phase("application"):
+        app = Application(
+            animal_list, root_directory, animal_handler.build_catalog(animal_list), animal_handler
+        )
     app.mainloop()
-    animal_handler.save_animals(animal_list)
+    with profiler.phase("stop_autosave"):
+        animal_handler.stop_autosave()
+        animal_handler.close_journal()
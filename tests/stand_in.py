@@ -0,0 +1,33 @@
+from acnhanimaltracker.animals import AnimalHandler
+from benchmarks.synthetic import synthetic_image
+
+
+class StandInHandler(AnimalHandler):
+    """AnimalHandler answering the API and image requests from a synthetic
+    catalog. The images of the animals in {bad_images} are no images.
+
+    Args:
+        root_directory (str): The root directory of the test installation
+        catalog (dict): The catalog created by synthetic_catalog, may be
+        replaced later to simulate changes of the API
+        bad_images (Iterable[tuple[str, int]], optional): (kind, id) of the
+        animals with a broken image. Defaults to ().
+    """
+
+    def __init__(self, root_directory: str, catalog: dict, bad_images=()) -> None:
+        super().__init__(root_directory)
+        self.catalog = catalog
+        self.bad_images = set(bad_images)
+        self.endpoint_kinds = {
+            self.fish_api_endpoint: "fish",
+            self.bug_api_endpoint: "bugs",
+            self.sea_api_endpoint: "sea_creatures",
+        }
+
+    def _request_endpoint(self, endpoint: str, conditional: bool) -> tuple[dict | None, dict[str, str]]:
+        return self.catalog[self.endpoint_kinds[endpoint]], {}
+
+    def _fetch_image(self, animal) -> bytes:
+        if (animal.kind, animal.id) in self.bad_images:
+            return b"not an image"
+        return synthetic_image(animal.id, (64, 64))
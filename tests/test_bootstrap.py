@@ -0,0 +1,42 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import threading
+import unittest
+from acnhanimaltracker.animals.bootstrap import stream_bootstrap
+from acnhanimaltracker.helper import is_folder_structure_intact
+from benchmarks.synthetic import synthetic_catalog
+from stand_in import StandInHandler
+
+
+class StreamBootstrapTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_directory)
+        with contextlib.redirect_stdout(io.StringIO()):
+            is_folder_structure_intact(self.root_directory)
+
+    def test_undecodable_image_is_left_for_repair(self) -> None:
+        handler = StandInHandler(self.root_directory, synthetic_catalog(30), bad_images=[("bugs", 3)])
+        result = []
+        # A hanging process pool must fail the test instead of blocking it
+        thread = threading.Thread(
+            target=lambda: result.append(stream_bootstrap(handler, download_workers=4, resize_workers=1)),
+            daemon=True,
+        )
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            thread.start()
+            thread.join(120)
+        self.assertFalse(thread.is_alive(), "stream_bootstrap did not return")
+        self.assertIn("Could not resize the image of bugs 3", output.getvalue())
+        animal_list = result[0]
+        self.assertEqual(sum(len(animal_type) for animal_type in animal_list), 30)
+
+        report = handler.verify_integrity(handler.load_animals())
+        self.assertEqual([(animal.kind, animal.id) for animal in report.missing], [("bugs", 3)])
+        self.assertEqual(report.missing_kinds, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
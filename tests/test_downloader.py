@@ -0,0 +1,119 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from acnhanimaltracker.animals import downloader
+from acnhanimaltracker.animals.downloader import Downloader, DownloadError
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers like an image host or the API, with scripted failures. The
+    number of requests per path is counted in server.attempts."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_) -> None:
+        pass
+
+    def send(self, status: int, body: bytes = b"", content_type: str = "image/png", **headers) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        attempts = self.server.attempts
+        attempts[self.path] = attempts.get(self.path, 0) + 1
+        attempt = attempts[self.path]
+        if self.path == "/flaky":
+            self.send(503 if attempt <= 2 else 200, PNG)
+        elif self.path == "/unavailable":
+            self.send(503)
+        elif self.path == "/broken-stream" and attempt == 1:
+            # Announces a chunk and closes the connection halfway through it
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"40\r\n" + PNG[:10])
+            self.close_connection = True
+        elif self.path == "/broken-stream":
+            self.send(200, PNG)
+        elif self.path == "/html":
+            self.send(200, b"<html></html>", "text/html")
+        elif self.path == "/large":
+            self.send(200, b"\x00" * 2048)
+        elif self.path == "/missing":
+            self.send(404)
+        elif self.path == "/json":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send(304, content_type="application/json", ETag='"v1"')
+            else:
+                self.send(200, b'{"id": 1}', "application/json", ETag='"v1"')
+        else:
+            self.send(200, PNG)
+
+
+class DownloaderTest(unittest.TestCase):
+    """Runs the Downloader against a local stand-in HTTP server."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.server.attempts = {}
+        self.downloader = Downloader(timeout=(2, 2), retries=3, backoff=0.01, max_size=1024)
+        self.sleeps = []
+        patcher = mock.patch.object(downloader.time, "sleep", self.sleeps.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.downloader.close)
+
+    def test_retries_with_exponential_backoff(self) -> None:
+        self.assertEqual(self.downloader.get_image(f"{self.base_url}/flaky"), PNG)
+        self.assertEqual(self.server.attempts["/flaky"], 3)
+        self.assertEqual(self.sleeps, [0.01, 0.02])
+
+    def test_gives_up_after_all_retries(self) -> None:
+        with self.assertRaises(DownloadError):
+            self.downloader.get_image(f"{self.base_url}/unavailable")
+        self.assertEqual(self.server.attempts["/unavailable"], 4)
+        self.assertEqual(self.sleeps, [0.01, 0.02, 0.04])
+
+    def test_retries_broken_streams(self) -> None:
+        self.assertEqual(self.downloader.get_image(f"{self.base_url}/broken-stream"), PNG)
+        self.assertEqual(self.server.attempts["/broken-stream"], 2)
+
+    def test_rejects_unusable_content_without_retrying(self) -> None:
+        for path in ("/html", "/large", "/missing"):
+            with self.subTest(path=path), self.assertRaises(DownloadError):
+                self.downloader.get_image(f"{self.base_url}{path}")
+            self.assertEqual(self.server.attempts[path], 1)
+        self.assertEqual(self.sleeps, [])
+
+    def test_conditional_requests(self) -> None:
+        result = self.downloader.get(f"{self.base_url}/json", content_type="application/json")
+        self.assertEqual((result.status_code, result.json()), (200, {"id": 1}))
+        self.assertEqual(result.headers["etag"], '"v1"')
+        result = self.downloader.get(
+            f"{self.base_url}/json", content_type="application/json", headers={"If-None-Match": '"v1"'}
+        )
+        self.assertEqual((result.status_code, result.content), (304, b""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import contextlib
+import copy
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from acnhanimaltracker.animals import AnimalHandler
+from acnhanimaltracker.animals.animal_store import DEFAULT_PROFILE
+from acnhanimaltracker.animals.journal import ProgressJournal
+from acnhanimaltracker.helper import is_folder_structure_intact
+from benchmarks.synthetic import synthetic_catalog
+from stand_in import StandInHandler
+
+
+def legacy_pickle(module: str, class_name: str, state: dict) -> bytes:
+    """Pickle of an animal of the old layout: an object of {class_name} whose
+    __dict__ holds {state}, written by hand since today's animals use
+    __slots__."""
+    # PROTO 2, GLOBAL, EMPTY_TUPLE, NEWOBJ, <state>, BUILD, STOP
+    state_pickle = pickle.dumps(state, protocol=2)[2:-1]
+    return b"\x80\x02c" + f"{module}\n{class_name}\n".encode() + b")\x81" + state_pickle + b"b."
+
+
+class ProgressTest(unittest.TestCase):
+    """Keeps the caught progress through migration, profiles, crashes and
+    syncs of an installation with a synthetic catalog."""
+
+    def setUp(self) -> None:
+        self.root_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_directory)
+        with contextlib.redirect_stdout(io.StringIO()):
+            is_folder_structure_intact(self.root_directory)
+        self.catalog = synthetic_catalog(30)
+
+    def fill_store(self, handler: AnimalHandler) -> None:
+        for kind, response in self.catalog.items():
+            animal_class = handler.animal_classes[kind]
+            api_responses = list(response.values())
+            save_names = [
+                animal_class(api_response, self.root_directory).save_name for api_response in api_responses
+            ]
+            handler.store.replace_kind(kind, api_responses, save_names)
+
+    def find(self, animal_list, kind: str, animal_id: int):
+        return next(
+            animal
+            for animal_type in animal_list
+            for animal in animal_type
+            if (animal.kind, animal.id) == (kind, animal_id)
+        )
+
+    def test_migrates_pickles_with_caught_status(self) -> None:
+        handler = AnimalHandler(self.root_directory)
+        caught = {("fish", 2), ("bugs", 5)}
+        for animal_class, directory in handler.animal_directories:
+            for api_response in self.catalog[animal_class.kind].values():
+                animal = animal_class(api_response, self.root_directory)
+                state = {
+                    "api_response": api_response,
+                    "root_directory": self.root_directory,
+                    "id": animal.id,
+                    "save_name": animal.save_name,
+                    "caught": (animal.kind, animal.id) in caught,
+                }
+                path = os.path.join(self.root_directory, directory, f"{animal.save_name}.pkl")
+                with open(path, "wb") as file_handler:
+                    file_handler.write(
+                        legacy_pickle("acnhanimaltracker.animals.animal", animal_class.__name__, state)
+                    )
+
+        animal_list = handler.load_animals()
+
+        self.assertEqual(sum(len(animal_type) for animal_type in animal_list), 30)
+        loaded = {(animal.kind, animal.id) for animal in sum(animal_list, []) if animal.caught}
+        self.assertEqual(loaded, caught)
+        self.assertEqual(handler.store.load_caught(), caught)
+
+    def test_profiles_keep_their_own_progress(self) -> None:
+        handler = AnimalHandler(self.root_directory)
+        self.fill_store(handler)
+        animal_list = handler.load_animals()
+        self.find(animal_list, "fish", 1).set_caught_status(True)
+        handler.save_changes()
+
+        handler.switch_profile("alice", animal_list, create=True)
+        self.assertFalse(self.find(animal_list, "fish", 1).caught)
+        self.find(animal_list, "bugs", 2).set_caught_status(True)
+        handler.save_changes()
+
+        self.assertEqual(handler.store.load_caught(DEFAULT_PROFILE), {("fish", 1)})
+        self.assertEqual(handler.store.load_caught("alice"), {("bugs", 2)})
+        self.assertEqual(handler.store.active_profile(), "alice")
+
+        handler.switch_profile(DEFAULT_PROFILE, animal_list, persist=False)
+        self.assertTrue(self.find(animal_list, "fish", 1).caught)
+        self.assertFalse(self.find(animal_list, "bugs", 2).caught)
+        self.assertEqual(handler.store.active_profile(), "alice")
+
+    def test_recovers_the_journal_of_a_crashed_session(self) -> None:
+        handler = AnimalHandler(self.root_directory)
+        self.fill_store(handler)
+        journal = ProgressJournal(self.root_directory, handler.animal_classes, DEFAULT_PROFILE)
+        journal.open()
+        journal.append("fish", 3, True)
+        journal.append("sea_creatures", 1, True)
+        journal.append("fish", 3, False)
+        journal.append("fish", 3, True)
+        journal.flush()
+        # Crash: the records are on disk and the lock is gone, nothing was
+        # saved into the store
+        journal._stop.set()
+        journal._flusher.join()
+        journal._file.close()
+
+        animal_list = handler.load_animals()
+        self.assertEqual(handler.open_journal(animal_list), 2)
+        self.assertTrue(self.find(animal_list, "fish", 3).caught)
+        self.assertTrue(self.find(animal_list, "sea_creatures", 1).caught)
+        handler.close_journal()
+
+        self.assertEqual(handler.store.load_caught(), {("fish", 3), ("sea_creatures", 1)})
+        self.assertEqual(os.listdir(journal.directory), [])
+
+    def test_sync_keeps_the_caught_status(self) -> None:
+        handler = StandInHandler(self.root_directory, self.catalog)
+        self.fill_store(handler)
+        animal_list = handler.load_animals()
+        fish = self.find(animal_list, "fish", 4)
+        fish.set_caught_status(True)
+        handler.save_changes()
+
+        catalog = copy.deepcopy(self.catalog)
+        changed = next(api_response for api_response in catalog["fish"].values() if api_response["id"] == 4)
+        changed["price"] = 99999
+        added = copy.deepcopy(changed)
+        added.update(id=500, name={"name-USen": "new fish"})
+        catalog["fish"]["new_fish"] = added
+        handler.catalog = catalog
+        with contextlib.redirect_stdout(io.StringIO()):
+            new, updated = handler.sync_animals(animal_list)
+
+        self.assertEqual([(animal.kind, animal.id) for animal in new], [("fish", 500)])
+        self.assertEqual(updated, [fish])
+        self.assertEqual((fish.price, fish.caught), (99999, True))
+        self.assertEqual(handler.store.load_caught(), {("fish", 4)})
+        stored = {(kind, api_response["id"]): api_response for kind, api_response, _ in handler.store.load()}
+        self.assertEqual(stored[("fish", 4)], changed)
+
+
+if __name__ == "__main__":
+    unittest.main()